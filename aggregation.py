@@ -0,0 +1,42 @@
+import pandas as pd
+
+GROUP_COLUMNS = {
+    'Game Title': 'Title',
+    'Setting': 'Setting',
+    'Resolution': 'Resolution',
+}
+AGGREGATIONS = ['mean', 'median', 'max', 'min']
+
+# Matches e.g. "1080p", "1440p", "4K" or "2560x1440" inside a setting label
+_RESOLUTION_PATTERN = r'(?i)\b(\d{3,4}p|[1-8]k|\d{3,4}x\d{3,4})\b'
+
+def split_test_labels(tests):
+    """Split "Title - Setting" labels into Title, Setting and Resolution columns.
+
+    Only the distinct labels are parsed (a large table repeats a few hundred of
+    them); the parts are then broadcast back to the rows by their codes.
+    """
+    codes, uniques = pd.factorize(tests.astype(str))
+    labels = pd.Series(uniques)
+    parts = labels.str.partition(' - ')
+    resolution = parts[2].str.extract(_RESOLUTION_PATTERN, expand=False).str.upper()
+    # "1080P" -> "1080p" while keeping "4K" and "2560X1440" readable
+    resolution = resolution.str.replace(r'^(\d+)P$', r'\1p', regex=True).str.replace('X', 'x')
+
+    unique_parts = pd.DataFrame({
+        'Title': parts[0],
+        'Setting': parts[2].where(parts[2] != '', 'Default'),
+        'Resolution': resolution.fillna('Unknown'),
+    })
+    return unique_parts.iloc[codes].set_index(tests.index)
+
+def aggregate_view(df, group_by, metrics, how='mean'):
+    """Collapse the results to one row per group, labelled in a 'Test' column so the chart builders can draw it"""
+    column = GROUP_COLUMNS[group_by]
+    keys = split_test_labels(df['Test'])[column]
+    values = df[metrics].apply(pd.to_numeric, errors='coerce')
+
+    grouped = values.groupby(keys, sort=True)
+    result = grouped.agg(how)
+    result.insert(0, 'Tests', grouped.size())
+    return result.rename_axis('Test').reset_index()
@@ -1,19 +1,23 @@
 import streamlit as st
 import pandas as pd
-import numpy as np
-import plotly.express as px
-import plotly.graph_objects as go
-from PIL import Image
-import base64
-from io import BytesIO
-import os
 import io
-import json
-from datetime import datetime
+import os
 
-from utils import set_page_config, apply_custom_css, load_image_url
+from utils import set_page_config, apply_custom_css, load_image, load_image_url, get_image_png
 from data_handler import (
-    parse_file_contents, 
+    FPS_METRICS,
+    preview_table,
+    get_history,
+    sync_results,
+    get_session_id,
+    index_scores,
+    check_import_path,
+    get_import_root,
+    list_import_files,
+    preview_path,
+    normalize_chunk,
+    detect_import_units,
+    FileTailer,
     save_session_data, 
     load_session_data,
     export_to_csv,
@@ -24,8 +28,24 @@ from chart_builder import (
     build_bar_chart, 
     build_line_chart, 
     build_stacked_bar_chart,
-    highlight_best_performance
+    extend_chart,
+    build_diverging_bar_chart,
+    highlight_regressions,
+    build_frametime_histogram,
+    build_percentile_chart,
+    build_stutter_chart,
+    highlight_best_performance,
+    get_shared_figure
 )
+from import_jobs import ImportJob, PathImportJob
+from run_stats import aggregate_runs, error_columns
+from comparison import list_configs, compare_configs
+from regression import RegressionMonitor, DEFAULT_WINDOW, DEFAULT_THRESHOLD
+from frametime import read_frametimes, summarize_frametimes
+from aggregation import GROUP_COLUMNS, AGGREGATIONS, aggregate_view, split_test_labels
+from shared_cache import shared_cache, frame_nbytes
+from mapping_profiles import profile_store, resolve_column_mapping, header_signature
+from suites import ScoreTable, OVERALL, to_wide
 
 # Set page config and apply custom styles
 set_page_config()
@@ -44,6 +64,18 @@ if 'column_mapping' not in st.session_state:
     st.session_state.column_mapping = {}
 if 'highlight_best' not in st.session_state:
     st.session_state.highlight_best = True
+if 'aggregate_runs' not in st.session_state:
+    st.session_state.aggregate_runs = False
+if 'data_version' not in st.session_state:
+    st.session_state.data_version = 0
+if 'frametime_runs' not in st.session_state:
+    st.session_state.frametime_runs = {}
+if 'frametime_uploads' not in st.session_state:
+    st.session_state.frametime_uploads = 0
+if 'regression_window' not in st.session_state:
+    st.session_state.regression_window = DEFAULT_WINDOW
+if 'regression_threshold' not in st.session_state:
+    st.session_state.regression_threshold = DEFAULT_THRESHOLD * 100
 
 # Load saved session data
 load_session_data()
@@ -52,17 +84,219 @@ load_session_data()
 col1, col2 = st.columns([1, 5])
 with col1:
     try:
-        # Load from local file instead of URL
-        from PIL import Image
-        logo = Image.open("generated-icon.png")
-        st.image(logo, width=80)
+        # Served from the asset cache, so reruns skip decoding and re-encoding
+        logo = load_image("generated-icon.png")
+        st.image(get_image_png(logo), width=80)
     except Exception as e:
         st.error(f"Error loading local logo: {str(e)}")
 with col2:
     st.title("Benchmark Visualizer")
 
+def get_regression_monitor():
+    """Return the regression monitor, rebuilding it only when the settings or non-append edits invalidate it"""
+    monitor = st.session_state.get('regression_monitor')
+    settings = (st.session_state.regression_window, st.session_state.regression_threshold / 100)
+    if (monitor is None or (monitor.window, monitor.threshold) != settings
+            or monitor.data_version != st.session_state.data_version):
+        monitor = RegressionMonitor(window=settings[0], threshold=settings[1])
+        monitor.update(st.session_state.tests)
+        monitor.data_version = st.session_state.data_version
+        st.session_state.regression_monitor = monitor
+    return monitor
+
+def record_appended_rows(new_rows, label):
+    """Append rows as a new version, feeding them to the regression monitor incrementally"""
+    monitor = st.session_state.get('regression_monitor')
+    in_sync = monitor is not None and monitor.data_version == st.session_state.data_version
+    get_history().append(new_rows, label)
+    sync_results()
+    if in_sync:
+        monitor.update(new_rows)
+        monitor.data_version = st.session_state.data_version
+
+@st.fragment(run_every=1.0)
+def poll_import_job():
+    """Refresh the progress of a running import without blocking the rest of the app"""
+    job = st.session_state.import_job
+    if not job.running:
+        # Finished, cancelled or failed: the full script run picks up the result
+        st.rerun(scope="app")
+
+    st.progress(job.progress, text=f"Importing {job.name}: {job.rows_read:,} rows ({job.chunks_read} chunks)")
+    if st.button("Cancel Import"):
+        job.cancel()
+
+def show_import_progress():
+    """Show the background import job; polling only runs while a job is in progress"""
+    job = st.session_state.get('import_job')
+    if job is None:
+        return
+
+    if job.running:
+        poll_import_job()
+    elif job.status == 'done':
+        st.session_state.import_job = None
+        # Appended onto whatever version is current, even if the data changed while the job ran
+        record_appended_rows(job.new_rows, f"Import {job.name}")
+        save_session_data()
+        st.toast(f"Imported {job.rows_read:,} rows from {job.name}")
+        st.rerun()
+    elif job.status == 'cancelled':
+        st.warning(f"Import of {job.name} was cancelled.")
+        if st.button("Dismiss"):
+            st.session_state.import_job = None
+            st.rerun()
+    else:
+        st.error(f"Error importing {job.name}: {job.error}")
+        if st.button("Dismiss"):
+            st.session_state.import_job = None
+            st.rerun()
+
+def get_sorted_results():
+    """Results ordered by Test for display, sorted once per data version and shared across sessions"""
+    if st.session_state.tests.empty:
+        return st.session_state.tests
+    handle = st.session_state.get('sorted_results')
+    if handle is None or handle.key != ('sorted', st.session_state.data_version):
+        tests = st.session_state.tests
+        # Stable, so repeated runs of a Test stay in run order
+        handle = shared_cache.acquire(('sorted', st.session_state.data_version),
+                                      lambda: tests.sort_values(by='Test', kind='stable'),
+                                      get_session_id(), frame_nbytes)
+        st.session_state.sorted_results = handle
+    return handle.value
+
+def get_score_table():
+    """Points results in long form with suite and sub-score indexes, built once per data version and shared"""
+    handle = st.session_state.get('score_table')
+    if handle is None or handle.key != ('scores', st.session_state.data_version):
+        tests = st.session_state.tests
+        handle = shared_cache.acquire(('scores', st.session_state.data_version), lambda: ScoreTable(tests),
+                                      get_session_id())
+        st.session_state.score_table = handle
+    return handle.value
+
+def get_metric_chart(df, metric, metrics, flagged, chart_type=None):
+    """Chart one metric (all of them when stacked), reusing the figure any session already built"""
+    chart_type = chart_type or st.session_state.chart_type
+    theme = st.session_state.theme
+    highlight = st.session_state.highlight_best and chart_type == 'bar'
+    flagged = sorted(flagged) if chart_type == 'bar' else []
+
+    def build():
+        if chart_type == 'bar':
+            fig = build_bar_chart(df, 'Test', metric, theme, error_columns=error_columns(df, metric))
+        elif chart_type == 'line':
+            fig = build_line_chart(df, 'Test', metric, theme, error_columns=error_columns(df, metric))
+        else:
+            fig = build_stacked_bar_chart(df, 'Test', metrics, theme)
+        if highlight:
+            highlight_best_performance(fig, df, 'Test', metric)
+        if chart_type == 'bar':
+            highlight_regressions(fig, flagged)
+        return fig
+
+    return get_shared_figure(build, df, chart_type, metric, metrics, theme, highlight, flagged)
+
+@st.cache_data(max_entries=16, show_spinner=False)
+def get_run_statistics(df, metrics):
+    """Aggregate repeated runs per Test, cached so reruns reuse the bootstrap"""
+    return aggregate_runs(df, metrics)
+
+@st.cache_data(max_entries=32, show_spinner=False)
+def get_config_comparison(_df, data_version, config_a, config_b, metrics):
+    """Join two configs once per data version; switching the shown metric reuses the result"""
+    return compare_configs(_df, config_a, config_b, metrics)
+
+@st.cache_data(max_entries=32, show_spinner=False)
+def get_group_view(_df, data_version, selected_title, group_by, how, metrics):
+    """Group the filtered results once per data version; the chart only ever sees the grouped rows"""
+    return aggregate_view(_df, group_by, metrics, how)
+
+def show_column_mapping(df, key_prefix):
+    """Resolve which columns hold the Test label and each FPS metric, asking only about unknown headers"""
+    cols = df.columns.tolist()
+    mapping, known = resolve_column_mapping(cols)
+    signature = header_signature(cols)
+
+    if known and not st.checkbox("Edit Column Mapping", key=f"{key_prefix}_{signature}_edit"):
+        st.success("Known column layout: mapping loaded from a saved profile.")
+        st.session_state.column_mapping = mapping
+        return
+
+    st.subheader("Map Columns")
+    # Allow user to adjust mappings
+    col_mapping = {}
+    metrics = ['Test'] + FPS_METRICS
+    
+    for metric in metrics:
+        mapped = mapping.get(metric)
+        default_idx = cols.index(mapped) + 1 if mapped in cols else 0
+        # Keyed on the header signature, so another file starts from its own guess
+        col_mapping[metric] = st.selectbox(f"Map '{metric}' to", options=["None"] + cols, 
+                                         index=default_idx, key=f"{key_prefix}_{signature}_map_{metric}")
+    
+    # Store the mappings for this file only
+    st.session_state.column_mapping = {metric: col for metric, col in col_mapping.items() if col != "None"}
+
+def remember_column_mapping(df):
+    """Save the confirmed mapping as the profile for this header, so the next such file maps itself"""
+    if st.session_state.view_mode == 'FPS' and st.session_state.column_mapping:
+        profile_store.save(df.columns.tolist(), st.session_state.column_mapping)
+
+def reset_column_mapping(df):
+    """Forget the saved profile and the mapping widgets for this header, so it maps from the fuzzy guess again"""
+    cols = df.columns.tolist()
+    profile_store.forget(cols)
+    signature = header_signature(cols)
+    for key in [k for k in st.session_state if f"_{signature}_" in str(k)]:
+        del st.session_state[key]
+    st.session_state.column_mapping = {}
+
+@st.fragment(run_every=2.0)
+def show_live_tail():
+    """Poll the followed path and extend the live chart with newly appended rows"""
+    live = st.session_state.get('live_tail')
+    if live is None:
+        return
+
+    st.subheader(f"Live Tail: {live['name']}")
+    if st.button("Stop Live Tail"):
+        st.session_state.live_tail = None
+        st.rerun()
+
+    try:
+        raw = live['tailer'].poll()
+        if not raw.empty:
+            new_df = normalize_chunk(raw, live['view_mode'], live['column_mapping'], live['config_label'],
+                                     live['frametime_columns'])
+            record_appended_rows(new_df, f"Live tail {live['name']}")
+            save_session_data()
+            live['rows'] += len(new_df)
+
+            metric = live['metric'] or next((m for m in FPS_METRICS + ['Score'] if m in new_df.columns), None)
+            if metric in new_df.columns:
+                live['metric'] = metric
+                rows = new_df.dropna(subset=[metric])
+                if live['figure'] is None:
+                    if st.session_state.chart_type == 'line':
+                        live['figure'] = build_line_chart(rows, 'Test', metric, st.session_state.theme)
+                    else:
+                        live['figure'] = build_bar_chart(rows, 'Test', metric, st.session_state.theme)
+                else:
+                    # Only the new points are added; the existing traces are left as they are
+                    extend_chart(live['figure'], rows, 'Test', metric)
+    except Exception as e:
+        st.error(f"Error reading {live['name']}: {str(e)}")
+
+    st.caption(f"{live['rows']:,} rows appended")
+    if live['figure'] is not None:
+        st.plotly_chart(live['figure'], use_container_width=True, key="live_tail_chart")
+
 # Sidebar for controls and settings
 with st.sidebar:
+    show_import_progress()
+
     st.header("Settings")
     
     # Theme toggle
@@ -93,6 +327,14 @@ with st.sidebar:
     # Additional settings
     st.session_state.highlight_best = st.checkbox("Highlight Best Performance", 
                                                 value=st.session_state.highlight_best)
+    st.session_state.aggregate_runs = st.checkbox("Aggregate Repeated Runs", 
+                                                value=st.session_state.aggregate_runs,
+                                                help="Show the mean of repeated runs per Test with 95% bootstrap confidence intervals")
+    
+    with st.expander("Regression Alerts"):
+        st.number_input("Baseline Window (runs)", min_value=2, max_value=50, step=1, key="regression_window")
+        st.slider("Flag Drops Larger Than (%)", min_value=1.0, max_value=50.0, step=0.5,
+                  key="regression_threshold")
     
     # Export options
     st.subheader("Export")
@@ -109,11 +351,42 @@ with st.sidebar:
     
     # Clear data button
     if st.button("Clear All Data", type="primary"):
-        st.session_state.tests = pd.DataFrame()
+        get_history().clear()
+        sync_results()
         st.rerun()
 
+    # Every edit is a version; undo/redo just moves between them
+    history = get_history()
+    with st.expander("History"):
+        col1, col2 = st.columns(2)
+        with col1:
+            if st.button("Undo", disabled=not history.can_undo):
+                history.undo()
+                sync_results()
+                st.rerun()
+        with col2:
+            if st.button("Redo", disabled=not history.can_redo):
+                history.redo()
+                sync_results()
+                st.rerun()
+
+        entries = history.entries()
+        if len(entries) > 1:
+            labels = {version_id: f"v{version_id}: {change.label}" for version_id, change in entries}
+            version_ids = list(labels)
+            head = version_ids.index(history.version)
+            diff_from = st.selectbox("Compare From", version_ids, index=max(head - 1, 0), format_func=labels.get)
+            diff_to = st.selectbox("Compare To", version_ids, index=head, format_func=labels.get)
+            diff = history.diff(diff_from, diff_to)
+            st.caption(f"{len(diff['added'])} row(s) added, {len(diff['removed'])} removed, "
+                       f"{len(diff['changed'])} cell(s) changed")
+            if not diff['changed'].empty:
+                st.dataframe(diff['changed'], use_container_width=True, hide_index=True)
+            if not diff['added'].empty:
+                st.dataframe(diff['added'], use_container_width=True)
+
 # Main content area
-tabs = st.tabs(["Visualization", "Data Input", "Import Data"])
+tabs = st.tabs(["Visualization", "Data Input", "Import Data", "Frametime Analysis"])
 
 # Tab 1: Visualization
 with tabs[0]:
@@ -132,69 +405,153 @@ with tabs[0]:
         
         # Aggiunta a Tab 1: Visualizzazione (filtro per titolo principale)
         if not st.session_state.tests.empty:
-            st.session_state.tests.sort_values(by='Test', inplace=True)
-
             # Ricava tutti i titoli base (prima della -)
-            base_titles = st.session_state.tests['Test'].apply(lambda x: x.split(' - ')[0] if ' - ' in x else x)
+            base_titles = split_test_labels(st.session_state.tests['Test'])['Title']
             unique_titles = base_titles.unique().tolist()
 
             selected_title = st.selectbox("Filter by Game Title", options=["All"] + unique_titles)
 
-            filtered_df = st.session_state.tests.copy()
+            # Ordina per Test per mantenere gruppi uniti
+            filtered_df = get_sorted_results()
             if selected_title != "All":
                 filtered_df = filtered_df[filtered_df['Test'].str.startswith(selected_title)]
 
+            group_col1, group_col2 = st.columns(2)
+            with group_col1:
+                group_by = st.selectbox("Group By", options=["None"] + list(GROUP_COLUMNS))
+            with group_col2:
+                group_how = st.selectbox("Aggregate", options=AGGREGATIONS,
+                                         disabled=group_by == "None")
+
+            visible_tests = filtered_df['Test']
+
+            # Collapse the results to one bar per group before anything is drawn
+            if group_by != "None":
+                group_metrics = [col for col in FPS_METRICS + ['Score'] if col in filtered_df.columns]
+                if group_metrics:
+                    filtered_df = get_group_view(filtered_df, st.session_state.data_version, selected_title,
+                                                 group_by, group_how, group_metrics)
+
+            # Collapse repeated runs of the same Test into their mean and confidence interval
+            elif st.session_state.aggregate_runs:
+                stats_metrics = [col for col in FPS_METRICS + ['Score'] if col in filtered_df.columns]
+                if stats_metrics:
+                    filtered_df = get_run_statistics(filtered_df, stats_metrics)
+                    with st.expander("Run Statistics"):
+                        st.dataframe(filtered_df, use_container_width=True)
+
+            # Runs that dropped below their rolling baseline
+            regressions = get_regression_monitor().flags
+            regressions = regressions[regressions['Test'].isin(visible_tests)]
+            if not regressions.empty:
+                st.warning(f"{len(regressions)} regression(s) detected against the rolling baseline of previous runs.")
+                with st.expander("Flagged Runs"):
+                    st.dataframe(regressions, use_container_width=True, hide_index=True)
+
             # Visualizzazione grafico sulla base del filtro
             if st.session_state.view_mode == 'FPS':
-                fps_metrics = ['Avg FPS', '1% Low', 'Max FPS', 'Min FPS', '0.1% Low']
-                available_metrics = [col for col in fps_metrics if col in filtered_df.columns]
+                available_metrics = [col for col in FPS_METRICS if col in filtered_df.columns]
 
                 if available_metrics:
                     selected_metric = st.selectbox("Select Metric to Visualize", available_metrics)
 
-                    if st.session_state.chart_type == 'bar':
-                        fig = build_bar_chart(filtered_df, 'Test', selected_metric, st.session_state.theme)
-                    elif st.session_state.chart_type == 'line':
-                        fig = build_line_chart(filtered_df, 'Test', selected_metric, st.session_state.theme)
-                    else:
-                        fig = build_stacked_bar_chart(filtered_df, 'Test', available_metrics, st.session_state.theme)
-
-                    if st.session_state.highlight_best and st.session_state.chart_type == 'bar':
-                        highlight_best_performance(fig, filtered_df, 'Test', selected_metric)
-
+                    fig = get_metric_chart(filtered_df, selected_metric, available_metrics,
+                                           regressions.loc[regressions['Metric'] == selected_metric, 'Test'])
                     st.plotly_chart(fig, use_container_width=True)
 
                     if len(available_metrics) > 1 and st.checkbox("Show All Metrics Comparison"):
                         for metric in available_metrics:
                             if metric != selected_metric:
-                                if st.session_state.chart_type == 'bar':
-                                    fig = build_bar_chart(filtered_df, 'Test', metric, st.session_state.theme)
-                                elif st.session_state.chart_type == 'line':
-                                    fig = build_line_chart(filtered_df, 'Test', metric, st.session_state.theme)
-
-                                if st.session_state.highlight_best and st.session_state.chart_type == 'bar':
-                                    highlight_best_performance(fig, filtered_df, 'Test', metric)
-
+                                fig = get_metric_chart(filtered_df, metric, available_metrics,
+                                                       regressions.loc[regressions['Metric'] == metric, 'Test'])
                                 st.subheader(metric)
                                 st.plotly_chart(fig, use_container_width=True)
                 else:
                     st.warning("No FPS metrics found in the data. Please ensure your data contains FPS metrics.")
 
             else:  # Points mode
-                if 'Test' in filtered_df.columns and 'Score' in filtered_df.columns:
-                    if st.session_state.chart_type == 'bar':
-                        fig = build_bar_chart(filtered_df, 'Test', 'Score', st.session_state.theme)
-                    elif st.session_state.chart_type == 'line':
-                        fig = build_line_chart(filtered_df, 'Test', 'Score', st.session_state.theme)
+                score_table = get_score_table() if 'Score' in st.session_state.tests.columns else None
+                if score_table is not None and len(score_table.sub_scores) > 1:
+                    # Suites with sub-scores are charted from the long table, one chart per sub-score
+                    col1, col2 = st.columns(2)
+                    with col1:
+                        suites = st.multiselect("Suites", score_table.suites, default=score_table.suites)
+                    with col2:
+                        sub_scores = st.multiselect("Sub-scores", score_table.sub_scores,
+                                                    default=[s for s in score_table.sub_scores if s != OVERALL])
+                    scores = score_table.select(suites, sub_scores, tests=visible_tests)
+
+                    baseline_test = st.selectbox("Index Scores To", ["None"] + scores['Test'].unique().tolist())
+                    if baseline_test != "None":
+                        # Each suite and sub-score is indexed to its own baseline, so their scales line up
+                        scores = index_scores(scores, baseline_test, ['Value'], group_column=['Suite', 'Sub-score'])
+                        st.caption(f"Scores indexed to {baseline_test} = 100")
+
+                    if scores.empty:
+                        st.info("No scores for the selected suites and sub-scores.")
                     else:
-                        fig = build_bar_chart(filtered_df, 'Test', 'Score', st.session_state.theme)
-
-                    if st.session_state.highlight_best and st.session_state.chart_type == 'bar':
-                        highlight_best_performance(fig, filtered_df, 'Test', 'Score')
-
+                        wide = to_wide(scores)
+                        shown = [s for s in sub_scores if s in wide.columns]
+                        if st.session_state.chart_type == 'stacked':
+                            fig = get_metric_chart(wide, shown[0], shown, [], 'stacked')
+                            st.plotly_chart(fig, use_container_width=True)
+                        else:
+                            for sub_score in shown:
+                                flagged = (regressions.loc[regressions['Metric'] == 'Score', 'Test']
+                                           if sub_score == OVERALL else [])
+                                fig = get_metric_chart(wide, sub_score, shown, flagged)
+                                st.subheader(sub_score)
+                                st.plotly_chart(fig, use_container_width=True)
+                elif 'Test' in filtered_df.columns and 'Score' in filtered_df.columns:
+                    baseline_test = st.selectbox("Index Scores To", ["None"] + filtered_df['Test'].unique().tolist())
+                    if baseline_test != "None":
+                        score_columns = [col for col in ['Score', 'Score Median', 'Score Std', 'Score CI Low',
+                                                         'Score CI High'] if col in filtered_df.columns]
+                        filtered_df = index_scores(filtered_df, baseline_test, score_columns)
+                        st.caption(f"Scores indexed to {baseline_test} = 100")
+
+                    # Stacked has nothing to stack with a single score, so it falls back to bars
+                    chart_type = 'line' if st.session_state.chart_type == 'line' else 'bar'
+                    fig = get_metric_chart(filtered_df, 'Score', ['Score'],
+                                           regressions.loc[regressions['Metric'] == 'Score', 'Test'], chart_type)
                     st.plotly_chart(fig, use_container_width=True)
                 else:
                     st.warning("No Score data found. Please ensure your data contains Test and Score columns.")
+
+            # A/B comparison between two tagged configurations
+            configs = list_configs(st.session_state.tests)
+            if len(configs) >= 2 and st.checkbox("Compare Configurations"):
+                col1, col2 = st.columns(2)
+                with col1:
+                    config_a = st.selectbox("Baseline (A)", configs, index=0)
+                with col2:
+                    config_b = st.selectbox("Compared (B)", configs, index=1)
+
+                compare_metrics = [col for col in FPS_METRICS + ['Score'] if col in st.session_state.tests.columns]
+                if config_a == config_b:
+                    st.info("Select two different configurations to compare.")
+                elif compare_metrics:
+                    comparison = get_config_comparison(st.session_state.tests, st.session_state.data_version,
+                                                       config_a, config_b, compare_metrics)
+                    if comparison.empty:
+                        st.warning("The selected configurations have no tests in common.")
+                    else:
+                        col1, col2 = st.columns(2)
+                        with col1:
+                            compare_metric = st.selectbox("Metric to Compare", compare_metrics)
+                        with col2:
+                            delta_kind = st.radio("Delta", ["Percent", "Absolute"], horizontal=True)
+
+                        delta_column = f"{compare_metric} Delta %" if delta_kind == "Percent" else f"{compare_metric} Delta"
+                        deltas = comparison.dropna(subset=[delta_column])
+                        suffix = '%' if delta_kind == "Percent" else ''
+                        theme = st.session_state.theme
+                        fig = get_shared_figure(lambda: build_diverging_bar_chart(deltas, 'Test', delta_column, theme,
+                                                                                  suffix=suffix),
+                                                deltas, 'diverging', delta_column, theme, suffix)
+                        st.plotly_chart(fig, use_container_width=True)
+                        with st.expander("Comparison Table"):
+                            st.dataframe(comparison, use_container_width=True)
     else:
         st.info("No data available. Please add data through the 'Data Input' or 'Import Data' tabs.")
 
@@ -206,6 +563,8 @@ with tabs[1]:
         game_title = st.text_input("Game Title", key="game_title")
         setting_label = st.text_input("Graphics Setting (e.g. 1080p Ultra)", key="setting_label")
 
+        config = st.text_input("Config (optional, e.g. RTX 4080 / Driver 552.22)", key="entry_config")
+
         full_label = f"{game_title} - {setting_label}" if setting_label else game_title
 
         if st.session_state.view_mode == 'FPS':
@@ -237,12 +596,10 @@ with tabs[1]:
                         'Test': full_label,
                         'Score': score
                     }
+                if config:
+                    new_data['Config'] = config
 
-                if st.session_state.tests.empty:
-                    st.session_state.tests = pd.DataFrame([new_data])
-                else:
-                    st.session_state.tests = pd.concat([st.session_state.tests, pd.DataFrame([new_data])], ignore_index=True)
-
+                record_appended_rows(pd.DataFrame([new_data]), f"Add {full_label}")
                 save_session_data()
                 st.success(f"Added test: {full_label}")
                 st.rerun()
@@ -263,7 +620,9 @@ with tabs[1]:
         
         if st.button("Rename"):
             if new_name:
-                st.session_state.tests.loc[st.session_state.tests['Test'] == test_to_rename, 'Test'] = new_name
+                get_history().replace_values('Test', test_to_rename, new_name,
+                                             f"Rename {test_to_rename} to {new_name}")
+                sync_results()
                 save_session_data()
                 st.success(f"Renamed test from '{test_to_rename}' to '{new_name}'")
                 st.rerun()
@@ -274,151 +633,121 @@ with tabs[1]:
 with tabs[2]:
     st.subheader("Import Data from File")
     
+    config_label = st.text_input("Config Label (optional, e.g. RTX 4080 / Driver 552.22)", key="config_label",
+                                 help="Tag imported rows with the configuration they were measured on, for A/B comparison")
+    
     # File upload
     uploaded_file = st.file_uploader("Choose a CSV or TXT file", type=['csv', 'txt'])
     
     if uploaded_file is not None:
         try:
-            # Parse file
-            df = parse_file_contents(uploaded_file)
+            # Only the first rows are parsed here; the full file is imported in the background
+            file_extension = uploaded_file.name.split('.')[-1].lower()
+            df = preview_table(uploaded_file, file_extension)
             
             if df is not None and not df.empty:
                 st.success("File uploaded successfully!")
+                st.caption(f"Preview of the first {len(df)} rows")
                 st.dataframe(df, use_container_width=True)
                 
                 # Column mapping for FPS mode
                 if st.session_state.view_mode == 'FPS':
-                    st.subheader("Map Columns")
-                    cols = df.columns.tolist()
-                    
-                    # If we haven't already mapped columns
-                    if not st.session_state.column_mapping:
-                        # Try to guess mappings based on column names
-                        mapping = {}
-                        metrics = ['Test', 'Avg FPS', '1% Low', 'Max FPS', 'Min FPS', '0.1% Low']
-                        
-                        for metric in metrics:
-                            # Look for exact matches or close matches
-                            if metric in cols:
-                                mapping[metric] = metric
-                            else:
-                                # Try to find similar columns
-                                lower_cols = [col.lower() for col in cols]
-                                metric_lower = metric.lower()
-                                
-                                if 'test' in metric_lower and any('test' in col for col in lower_cols):
-                                    for col in cols:
-                                        if 'test' in col.lower() or 'name' in col.lower() or 'label' in col.lower():
-                                            mapping[metric] = col
-                                            break
-                                elif 'avg' in metric_lower and any('avg' in col.lower() for col in lower_cols):
-                                    for col in cols:
-                                        if 'avg' in col.lower() and 'fps' in col.lower():
-                                            mapping[metric] = col
-                                            break
-                                elif '1%' in metric_lower and any('1%' in col for col in lower_cols):
-                                    for col in cols:
-                                        if '1%' in col and 'low' in col.lower():
-                                            mapping[metric] = col
-                                            break
-                                elif 'max' in metric_lower and any('max' in col.lower() for col in lower_cols):
-                                    for col in cols:
-                                        if 'max' in col.lower() and 'fps' in col.lower():
-                                            mapping[metric] = col
-                                            break
-                                elif 'min' in metric_lower and any('min' in col.lower() for col in lower_cols):
-                                    for col in cols:
-                                        if 'min' in col.lower() and 'fps' in col.lower():
-                                            mapping[metric] = col
-                                            break
-                                elif '0.1%' in metric_lower and any('0.1%' in col for col in lower_cols):
-                                    for col in cols:
-                                        if '0.1%' in col and 'low' in col.lower():
-                                            mapping[metric] = col
-                                            break
-                        
-                        st.session_state.column_mapping = mapping
-                    
-                    # Allow user to adjust mappings
-                    col_mapping = {}
-                    metrics = ['Test', 'Avg FPS', '1% Low', 'Max FPS', 'Min FPS', '0.1% Low']
-                    
-                    for metric in metrics:
-                        default_idx = cols.index(st.session_state.column_mapping.get(metric, cols[0])) if metric in st.session_state.column_mapping else 0
-                        col_mapping[metric] = st.selectbox(f"Map '{metric}' to", options=["None"] + cols, 
-                                                         index=default_idx + 1 if metric in st.session_state.column_mapping else 0)
-                    
-                    # Store the mappings
-                    for metric, col in col_mapping.items():
-                        if col != "None":
-                            st.session_state.column_mapping[metric] = col
+                    show_column_mapping(df, 'upload')
                 
                 # Import Button
-                if st.button("Import Data"):
-                    # Process the dataframe according to the view mode
-                    if st.session_state.view_mode == 'FPS':
-                        # Create a new dataframe with the mapped columns
-                        new_df = pd.DataFrame()
-                        
-                        for metric, col in st.session_state.column_mapping.items():
-                            if col != "None" and col in df.columns:
-                                new_df[metric] = df[col]
-                        
-                        # Check if we have at least Test and one metric
-                        if 'Test' in new_df.columns and len(new_df.columns) > 1:
-                            # Add to existing data or create new
-                            if st.session_state.tests.empty:
-                                st.session_state.tests = new_df.copy()
-                            else:
-                                # Make sure columns match
-                                for col in new_df.columns:
-                                    if col not in st.session_state.tests.columns:
-                                        st.session_state.tests[col] = np.nan
-                                
-                                st.session_state.tests = pd.concat([st.session_state.tests, new_df], ignore_index=True)
-                            
-                            save_session_data()
-                            st.success("Data imported successfully!")
-                            st.rerun()
-                        else:
-                            st.error("Need at least Test column and one metric.")
-                    else:  # Points mode
-                        # For points mode, we need 'Test' and 'Score' columns
-                        if 'Test' not in df.columns and len(df.columns) >= 2:
-                            # Try to guess: first column is often the test name
-                            df = df.rename(columns={df.columns[0]: 'Test'})
-                        
-                        if 'Score' not in df.columns and len(df.columns) >= 2:
-                            # Try to guess: second column is often the score
-                            for col in df.columns:
-                                if col != 'Test':
-                                    df = df.rename(columns={col: 'Score'})
-                                    break
-                        
-                        if 'Test' in df.columns and 'Score' in df.columns:
-                            # Keep only the needed columns
-                            new_df = df[['Test', 'Score']].copy()
-                            
-                            # Add to existing data or create new
-                            if st.session_state.tests.empty:
-                                st.session_state.tests = new_df.copy()
-                            else:
-                                st.session_state.tests = pd.concat([st.session_state.tests, new_df], ignore_index=True)
-                            
-                            save_session_data()
-                            st.success("Data imported successfully!")
-                            st.rerun()
-                        else:
-                            st.error("Could not identify Test and Score columns.")
+                import_job = st.session_state.get('import_job')
+                if st.button("Import Data", disabled=import_job is not None and import_job.running):
+                    # Parsing and normalization run on a worker thread, which
+                    # gets its own (copy-on-write) view of the upload so previews can't move its cursor
+                    st.session_state.import_job = ImportJob(
+                        uploaded_file.name,
+                        io.BytesIO(uploaded_file.getvalue()),
+                        file_extension,
+                        st.session_state.view_mode,
+                        st.session_state.column_mapping,
+                        size=uploaded_file.size,
+                        config_label=config_label or None,
+                        frametime_columns=detect_import_units(df, st.session_state.view_mode,
+                                                              st.session_state.column_mapping)
+                    ).start()
+                    remember_column_mapping(df)
+                    st.rerun()
                 
                 # Reset mappings button
                 if st.session_state.view_mode == 'FPS' and st.button("Reset Column Mappings"):
-                    st.session_state.column_mapping = {}
+                    reset_column_mapping(df)
                     st.rerun()
+            else:
+                st.error("Could not parse the file format. Please check the file or try a different file.")
                     
         except Exception as e:
             st.error(f"Error processing file: {str(e)}")
     
+    st.subheader("Import from Server Path")
+    import_root = get_import_root()
+    if import_root is None:
+        st.caption("Server path import is disabled. Set BENCHMARK_IMPORT_ROOT to the directory it may read from.")
+        import_path = None
+    else:
+        import_path = st.text_input(f"File or directory under {import_root}", key="import_path",
+                                    placeholder="results.csv")
+    
+    if import_path:
+        try:
+            resolved_path = check_import_path(import_path)
+            path_files = list_import_files(resolved_path)
+            df = preview_path(resolved_path)
+            
+            if df is not None and not df.empty:
+                st.caption(f"{len(path_files)} file(s) found. Preview of the first {len(df)} rows of {os.path.basename(path_files[0])}")
+                st.dataframe(df, use_container_width=True)
+                
+                if st.session_state.view_mode == 'FPS':
+                    show_column_mapping(df, 'path')
+                
+                aggregate_rows = st.checkbox("Average repeated rows per Test (memory bounded by chunk size)", value=True)
+                
+                follow_new_only = st.checkbox("Live tail: only follow results appended from now on", value=True)
+                
+                import_job = st.session_state.get('import_job')
+                col1, col2 = st.columns(2)
+                with col1:
+                    if st.button("Import from Path", disabled=import_job is not None and import_job.running):
+                        st.session_state.import_job = PathImportJob(
+                            resolved_path,
+                            st.session_state.view_mode,
+                            st.session_state.column_mapping,
+                            aggregate=aggregate_rows,
+                            config_label=config_label or None,
+                            frametime_columns=detect_import_units(df, st.session_state.view_mode,
+                                                                  st.session_state.column_mapping)
+                        ).start()
+                        remember_column_mapping(df)
+                        st.rerun()
+                with col2:
+                    if st.button("Start Live Tail"):
+                        st.session_state.live_tail = {
+                            'name': os.path.basename(resolved_path.rstrip(os.sep)) or resolved_path,
+                            'tailer': FileTailer(resolved_path, from_end=follow_new_only),
+                            'view_mode': st.session_state.view_mode,
+                            'column_mapping': dict(st.session_state.column_mapping),
+                            'config_label': config_label or None,
+                            # Judged once from the preview, so polls with few rows can't flip the units
+                            'frametime_columns': detect_import_units(df, st.session_state.view_mode,
+                                                                     st.session_state.column_mapping),
+                            'metric': None,
+                            'figure': None,
+                            'rows': 0,
+                        }
+                        remember_column_mapping(df)
+                        st.rerun()
+            else:
+                st.error("Could not parse the file format. Please check the file or try a different file.")
+        except Exception as e:
+            st.error(f"Error reading path: {str(e)}")
+    
+    show_live_tail()
+    
     st.markdown("### Drag & Drop")
     st.info("You can also drag and drop CSV or TXT files directly onto the file uploader above.")
     
@@ -433,13 +762,79 @@ Game B - 1080p,95.2,75.1,110.3,62.8,55.1
 Benchmark A,10250
 Benchmark B,8750
 """
+        st.caption("Suites with sub-scores can keep them all, with an optional suite column:")
+        st.code("""Benchmark,CPU,Overall,Single-Core,Multi-Core
+Cinebench R23,CPU A,38000,2000,38000
+Cinebench R23,CPU B,40000,2200,40000
+""", language="csv")
     
     st.code(sample_csv, language="csv")
     st.caption("Note: The app will attempt to automatically map columns if their names are similar to the expected format.")
 
+# Tab 4: Frametime Analysis
+with tabs[3]:
+    st.subheader("Frametime Analysis")
+    
+    frame_files = st.file_uploader("Choose frametime capture logs (e.g. PresentMon, CapFrameX CSV)",
+                                   type=['csv', 'txt'], accept_multiple_files=True,
+                                   key=f"frametime_files_{st.session_state.frametime_uploads}")
+    
+    # Each log is scanned once on upload; the charts only read the stored summaries
+    for frame_file in frame_files or []:
+        run_name = frame_file.name.rsplit('.', 1)[0]
+        if run_name in st.session_state.frametime_runs:
+            continue
+        try:
+            st.session_state.frametime_runs[run_name] = {
+                'summary': summarize_frametimes(read_frametimes(frame_file)),
+                'added': False,
+            }
+        except Exception as e:
+            st.error(f"Error reading {frame_file.name}: {str(e)}")
+    
+    if st.session_state.frametime_runs:
+        run_names = list(st.session_state.frametime_runs.keys())
+        selected_runs = st.multiselect("Runs", run_names, default=run_names)
+        summaries = {name: st.session_state.frametime_runs[name]['summary'] for name in selected_runs}
+        
+        if summaries:
+            st.dataframe(pd.DataFrame([
+                {'Run': name, 'Frames': summary['frames'], 'Duration (s)': summary['duration_s'],
+                 'Median (ms)': summary['median_ms'], **summary['metrics'],
+                 **{f"Stutter > {m:g}x": count for m, count in summary['stutter'].items()}}
+                for name, summary in summaries.items()
+            ]), use_container_width=True, hide_index=True)
+            
+            analysis = st.radio("Chart", ["Histogram", "Percentile Curve", "Stutter Counts"], horizontal=True)
+            if analysis == "Histogram":
+                fig = build_frametime_histogram(summaries, st.session_state.theme)
+            elif analysis == "Percentile Curve":
+                fig = build_percentile_chart(summaries, st.session_state.theme)
+            else:
+                fig = build_stutter_chart(summaries, st.session_state.theme)
+            st.plotly_chart(fig, use_container_width=True)
+            
+            col1, col2 = st.columns(2)
+            with col1:
+                # Runs already added to the results are not added again
+                pending = [name for name in summaries if not st.session_state.frametime_runs[name]['added']]
+                if st.button("Add Summaries to Results", disabled=not pending):
+                    new_df = pd.DataFrame([{'Test': name, **summaries[name]['metrics']} for name in pending])
+                    record_appended_rows(new_df, "Add frametime summaries")
+                    for name in pending:
+                        st.session_state.frametime_runs[name]['added'] = True
+                    save_session_data()
+                    st.toast(f"Added {len(new_df)} run(s) to the results.")
+                    st.rerun()
+            with col2:
+                if st.button("Remove Selected Runs"):
+                    for name in selected_runs:
+                        st.session_state.frametime_runs.pop(name, None)
+                    # A fresh uploader, so the removed logs are not read again; kept runs stay summarized
+                    st.session_state.frametime_uploads += 1
+                    st.rerun()
+    else:
+        st.info("Upload one or more frametime logs to see histograms, percentile curves and stutter counts.")
+
 # Auto-save session when app closes or is refreshed
 save_session_data()
-
-# Alla visualizzazione grafico: ordina per Test per mantenere gruppi uniti
-if not st.session_state.tests.empty:
-    st.session_state.tests.sort_values(by='Test', inplace=True)
@@ -1,11 +1,48 @@
+from collections import OrderedDict
+
 import streamlit as st
-import pandas as pd
-import plotly.express as px
 import plotly.graph_objects as go
-import numpy as np
 
-def build_bar_chart(df, x_column, y_column, theme):
-    """Build a horizontal bar chart"""
+from data_handler import get_session_id
+from shared_cache import shared_cache, content_key
+
+# Figures a session keeps pinned in the shared cache, most recently shown last
+SESSION_FIGURES = 16
+
+def _figure_nbytes(fig):
+    """Rough size of a figure; its per-point trace data dominates"""
+    points = sum(len(values) for trace in fig.data for values in (trace.x, trace.y) if values is not None)
+    return 16_384 + points * 64
+
+def get_shared_figure(build, df, *params):
+    """Build a figure once per distinct data and settings and share it with every session showing it.
+
+    The figure is never modified after build() returns, so sessions can draw the same object.
+    """
+    owner = get_session_id()
+    handle = shared_cache.acquire(content_key('figure', df, *params), build, owner, _figure_nbytes)
+
+    figures = st.session_state.setdefault('figure_handles', OrderedDict())
+    figures.pop(handle.key, None)
+    figures[handle.key] = handle
+    while len(figures) > 1 and (len(figures) > SESSION_FIGURES or shared_cache.over_session_cap(owner)):
+        figures.popitem(last=False)
+
+    st.session_state.current_figure = handle.value
+    return handle.value
+
+def _error_extents(df, y_column, error_columns):
+    """Turn (low, high) interval columns into the plus/minus arrays Plotly expects"""
+    if not error_columns:
+        return None, None
+    low_column, high_column = error_columns
+    return df[high_column] - df[y_column], df[y_column] - df[low_column]
+
+def build_bar_chart(df, x_column, y_column, theme, error_columns=None):
+    """Build a horizontal bar chart, with optional (low, high) columns drawn as error bars"""
+    # plotly.express pulls in a large module tree, so load it on first use
+    import plotly.express as px
+
     # Choose colors based on theme
     if theme == 'dark':
         bg_color = '#121212'
@@ -22,6 +59,8 @@ def build_bar_chart(df, x_column, y_column, theme):
         main_color = '#ff7514'
         secondary_color = '#ff8c38'
 
+    error_plus, error_minus = _error_extents(df, y_column, error_columns)
+
     # Create horizontal bar chart
     fig = px.bar(
         df, 
@@ -30,6 +69,8 @@ def build_bar_chart(df, x_column, y_column, theme):
         orientation='h',
         color_discrete_sequence=[main_color],
         text=y_column,
+        error_x=error_plus,
+        error_x_minus=error_minus,
         height=max(400, len(df) * 40)  # Increase spacing slightly
     )
 
@@ -43,6 +84,8 @@ def build_bar_chart(df, x_column, y_column, theme):
         marker_line_color=main_color,
         marker=dict(line=dict(width=0), opacity=0.9, color=main_color),
     )
+    if error_columns:
+        fig.update_traces(error_x=dict(color=text_color, thickness=1.5, width=4))
 
     fig.update_layout(
         plot_bgcolor=plot_bg_color,
@@ -60,8 +103,8 @@ def build_bar_chart(df, x_column, y_column, theme):
     st.session_state.current_figure = fig
     return fig
 
-def build_line_chart(df, x_column, y_column, theme):
-    """Build a line chart"""
+def build_line_chart(df, x_column, y_column, theme, error_columns=None):
+    """Build a line chart, with optional (low, high) columns drawn as error bars"""
     # Choose colors based on theme
     if theme == 'dark':
         bg_color = '#121212'
@@ -76,6 +119,7 @@ def build_line_chart(df, x_column, y_column, theme):
     
     # Create sorted data
     df_sorted = df.sort_values(by=y_column, ascending=False)
+    error_plus, error_minus = _error_extents(df_sorted, y_column, error_columns)
     
     # Create line chart
     fig = go.Figure()
@@ -89,6 +133,8 @@ def build_line_chart(df, x_column, y_column, theme):
         line=dict(color='#ff7514', width=3),
         marker=dict(size=10, color='#ff7514', line=dict(width=2, color='white')),
         hovertemplate='<b>%{x}</b><br>%{y:.1f}',
+        error_y=dict(type='data', array=error_plus, arrayminus=error_minus,
+                     color=text_color, thickness=1.5, width=4) if error_columns else None,
     ))
     
     # Update layout
@@ -144,8 +190,7 @@ def build_stacked_bar_chart(df, x_column, y_columns, theme):
 
     color_sequence = ['#ff7514', '#ffa35c', '#ffba80', '#ffd1a4']
 
-    df['total'] = df[y_columns].sum(axis=1)
-    df_sorted = df.sort_values(by='total', ascending=False)
+    df_sorted = df.assign(total=df[y_columns].sum(axis=1)).sort_values(by='total', ascending=False)
 
     fig = go.Figure()
     for i, y_column in enumerate(y_columns):
@@ -180,6 +225,51 @@ def build_stacked_bar_chart(df, x_column, y_columns, theme):
     st.session_state.current_figure = fig
     return fig
 
+def build_diverging_bar_chart(df, x_column, y_column, theme, suffix=''):
+    """Build a horizontal bar chart of signed deltas, green for gains and red for losses"""
+    if theme == 'dark':
+        bg_color = '#121212'
+        text_color = 'white'
+        plot_bg_color = '#1E1E1E'
+        grid_color = '#333333'
+    else:
+        bg_color = 'white'
+        text_color = '#333333'
+        plot_bg_color = '#f5f5f5'
+        grid_color = '#dddddd'
+
+    df_sorted = df.sort_values(by=y_column, ascending=True)
+    colors = ['#2ecc71' if value >= 0 else '#e74c3c' for value in df_sorted[y_column]]
+
+    fig = go.Figure()
+    fig.add_trace(go.Bar(
+        y=df_sorted[x_column],
+        x=df_sorted[y_column],
+        orientation='h',
+        marker_color=colors,
+        text=df_sorted[y_column],
+        texttemplate='%{x:+.1f}' + suffix,
+        textposition='outside',
+        hovertemplate='<b>%{y}</b><br>%{x:+.2f}' + suffix,
+        opacity=0.95
+    ))
+
+    fig.update_layout(
+        plot_bgcolor=plot_bg_color,
+        paper_bgcolor=bg_color,
+        font_color=text_color,
+        margin=dict(l=10, r=10, t=30, b=10),
+        xaxis_title=y_column,
+        yaxis_title=None,
+        xaxis=dict(showgrid=True, gridcolor=grid_color, zeroline=True, zerolinecolor=text_color, zerolinewidth=1),
+        yaxis=dict(showgrid=False, categoryorder='array', categoryarray=df_sorted[x_column].tolist()),
+        hoverlabel=dict(bgcolor=plot_bg_color, font_color=text_color, font_size=14),
+        height=max(400, len(df) * 40)
+    )
+
+    st.session_state.current_figure = fig
+    return fig
+
 def highlight_best_performance(fig, df, x_column, y_column):
     """Highlight the best performing test in green"""
     # Get the best performance (highest value)
@@ -201,3 +291,129 @@ def highlight_best_performance(fig, df, x_column, y_column):
         
         # Update the marker colors
         fig.data[0].marker.color = colors
+
+def _trace_values(values):
+    """Trace data as a tuple; Plotly stores it as numpy arrays, which have no truth value"""
+    return () if values is None else tuple(values)
+
+def extend_chart(fig, new_df, x_column, y_column):
+    """Append new rows to the first trace of a bar or line chart instead of rebuilding it"""
+    trace = fig.data[0]
+    labels = new_df[x_column].tolist()
+    values = new_df[y_column].tolist()
+
+    if trace.orientation == 'h':
+        # Horizontal bars keep the labels on the y axis
+        trace.y = _trace_values(trace.y) + tuple(labels)
+        trace.x = _trace_values(trace.x) + tuple(values)
+        fig.layout.height = max(400, len(trace.y) * 40)
+    else:
+        trace.x = _trace_values(trace.x) + tuple(labels)
+        trace.y = _trace_values(trace.y) + tuple(values)
+
+    if trace.text is not None:
+        trace.text = _trace_values(trace.text) + tuple(values)
+
+    return fig
+
+def highlight_regressions(fig, flagged_tests):
+    """Colour the bars of tests with a flagged regression in red"""
+    flagged = set(flagged_tests)
+    if not flagged:
+        return
+
+    trace = fig.data[0]
+    colors = trace.marker.color
+    if isinstance(colors, str) or colors is None:
+        colors = [colors or '#ff7514'] * len(trace.y)
+    trace.marker.color = ['#e74c3c' if label in flagged else color for label, color in zip(trace.y, colors)]
+
+FRAMETIME_COLORS = ['#ff7514', '#3498db', '#2ecc71', '#9b59b6', '#f1c40f', '#e74c3c']
+
+def _frametime_layout(fig, theme, xaxis_title, yaxis_title):
+    """Apply the shared theme to the frametime analysis charts"""
+    if theme == 'dark':
+        bg_color = '#121212'
+        text_color = 'white'
+        plot_bg_color = '#1E1E1E'
+        grid_color = '#333333'
+    else:
+        bg_color = 'white'
+        text_color = '#333333'
+        plot_bg_color = '#f5f5f5'
+        grid_color = '#dddddd'
+
+    fig.update_layout(
+        plot_bgcolor=plot_bg_color,
+        paper_bgcolor=bg_color,
+        font_color=text_color,
+        margin=dict(l=10, r=10, t=30, b=10),
+        xaxis_title=xaxis_title,
+        yaxis_title=yaxis_title,
+        legend=dict(orientation='h', yanchor='top', y=1.08, xanchor='center', x=0.5),
+        xaxis=dict(showgrid=True, gridcolor=grid_color, zeroline=False),
+        yaxis=dict(showgrid=True, gridcolor=grid_color, zeroline=False),
+        hoverlabel=dict(bgcolor=plot_bg_color, font_color=text_color, font_size=14),
+        height=450,
+    )
+
+def build_frametime_histogram(summaries, theme):
+    """Build overlaid frametime histograms from precomputed run summaries"""
+    fig = go.Figure()
+    for i, (name, summary) in enumerate(summaries.items()):
+        edges = summary['hist_edges']
+        # Share of frames per bin, so runs of different length are comparable
+        share = summary['hist_counts'] / max(summary['frames'], 1) * 100
+        fig.add_trace(go.Bar(
+            x=(edges[:-1] + edges[1:]) / 2,
+            y=share,
+            width=edges[1] - edges[0],
+            name=name,
+            marker_color=FRAMETIME_COLORS[i % len(FRAMETIME_COLORS)],
+            opacity=0.6,
+            hovertemplate='<b>%{x:.2f} ms</b><br>%{y:.2f}% of frames',
+        ))
+
+    fig.update_layout(barmode='overlay', bargap=0)
+    _frametime_layout(fig, theme, 'Frametime (ms)', 'Frames (%)')
+    st.session_state.current_figure = fig
+    return fig
+
+def build_percentile_chart(summaries, theme):
+    """Build frametime-vs-percentile curves from precomputed run summaries"""
+    fig = go.Figure()
+    for i, (name, summary) in enumerate(summaries.items()):
+        fig.add_trace(go.Scatter(
+            x=summary['percentiles'],
+            y=summary['percentile_ms'],
+            mode='lines',
+            name=name,
+            line=dict(color=FRAMETIME_COLORS[i % len(FRAMETIME_COLORS)], width=2),
+            hovertemplate='<b>P%{x:.1f}</b><br>%{y:.2f} ms',
+        ))
+
+    _frametime_layout(fig, theme, 'Percentile', 'Frametime (ms)')
+    # The tail is where stutter shows, so give the high percentiles more room
+    fig.update_xaxes(range=[50, 100])
+    st.session_state.current_figure = fig
+    return fig
+
+def build_stutter_chart(summaries, theme):
+    """Build grouped bars of stutter counts (frames over N x median) per run"""
+    fig = go.Figure()
+    for i, (name, summary) in enumerate(summaries.items()):
+        multipliers = list(summary['stutter'].keys())
+        fig.add_trace(go.Bar(
+            x=[f"> {m:g}x median" for m in multipliers],
+            y=list(summary['stutter'].values()),
+            name=name,
+            marker_color=FRAMETIME_COLORS[i % len(FRAMETIME_COLORS)],
+            text=list(summary['stutter'].values()),
+            textposition='outside',
+            hovertemplate='<b>%{x}</b><br>%{y} frames',
+        ))
+
+    fig.update_layout(barmode='group')
+    _frametime_layout(fig, theme, None, 'Stutter Frames')
+    st.session_state.current_figure = fig
+    return fig
@@ -0,0 +1,41 @@
+import numpy as np
+import pandas as pd
+
+CONFIG_COLUMN = 'Config'
+
+def list_configs(df):
+    """Return the config labels present in the results, in first-seen order"""
+    if CONFIG_COLUMN not in df.columns:
+        return []
+    return df[CONFIG_COLUMN].dropna().unique().tolist()
+
+def compare_configs(df, config_a, config_b, metrics, key='Test'):
+    """Join two configs on the Test key and compute B-vs-A deltas for every metric in one pass.
+
+    Repeated runs are averaged per config first. The result has one row per Test
+    present in both configs with '<metric> A', '<metric> B', '<metric> Delta' and
+    '<metric> Delta %' columns.
+    """
+    configs = df[CONFIG_COLUMN].to_numpy()
+    is_a = configs == config_a
+    is_b = configs == config_b
+    values = df[metrics].apply(pd.to_numeric, errors='coerce')
+    left = values[is_a].groupby(df.loc[is_a, key], sort=False).mean()
+    right = values[is_b].groupby(df.loc[is_b, key], sort=False).mean()
+
+    # Hash join on the Test index
+    joined = left.join(right, how='inner', lsuffix=' A', rsuffix=' B')
+
+    a_values = joined[[f'{m} A' for m in metrics]].to_numpy(dtype=float)
+    b_values = joined[[f'{m} B' for m in metrics]].to_numpy(dtype=float)
+    delta = b_values - a_values
+    with np.errstate(invalid='ignore', divide='ignore'):
+        delta_pct = np.where(a_values != 0, delta / a_values * 100, np.nan)
+
+    result = pd.DataFrame({key: joined.index})
+    for i, metric in enumerate(metrics):
+        result[f'{metric} A'] = a_values[:, i]
+        result[f'{metric} B'] = b_values[:, i]
+        result[f'{metric} Delta'] = delta[:, i]
+        result[f'{metric} Delta %'] = delta_pct[:, i]
+    return result
@@ -1,142 +1,573 @@
+import numpy as np
 import streamlit as st
+from streamlit.runtime.scriptrunner import get_script_run_ctx
 import pandas as pd
-import numpy as np
-import json
 import os
 from datetime import datetime
 import io
 import base64
-from io import BytesIO
-import plotly.graph_objects as go
-import tempfile
 import re
-from fpdf import FPDF
 
-def parse_file_contents(uploaded_file):
-    """Parse uploaded file contents into a DataFrame"""
-    # Get file extension
-    file_extension = uploaded_file.name.split('.')[-1].lower()
-    
-    try:
-        if file_extension == 'csv':
-            # Try to parse as CSV
-            df = pd.read_csv(uploaded_file)
-            return df
-        elif file_extension == 'txt':
-            # Try different parsing strategies for TXT files
-            content = uploaded_file.getvalue().decode('utf-8')
-            
-            # Try parsing as CSV first
-            try:
-                df = pd.read_csv(io.StringIO(content))
-                if not df.empty:
-                    return df
-            except:
-                pass
+from history import DatasetHistory
+from mapping_profiles import resolve_column_mapping, normalize_header
+from suites import SUB_SCORE_PREFIX
+
+# Rows per chunk when a file is parsed incrementally
+CHUNK_ROWS = 50_000
+
+FPS_METRICS = ['Avg FPS', '1% Low', 'Max FPS', 'Min FPS', '0.1% Low']
+
+IMPORT_EXTENSIONS = ('csv', 'txt')
+
+# Free-form records such as "Test: Game A - 1080p, Avg FPS: 120.5, 1% Low: 98.3"
+_RECORD_PATTERN = re.compile(r'([^:,]+):\s*([^,]+)')
+_RECORD_LINE = re.compile(r'^\s*[^:,]+:\s*[^,]+(,\s*[^:,]+:\s*[^,]+)*\s*$')
+
+# Headers of a Points file that name the suite rather than the test, or hold the overall score
+_SUITE_HEADERS = {'suite', 'suite name', 'benchmark', 'benchmark name'}
+_OVERALL_HEADER = re.compile(r'^score$|overall|total', re.IGNORECASE)
+
+# Headers that state the unit of a metric column
+_MS_HEADER = re.compile(r'\bms\b|millisec|frame ?times?\b|msbetween', re.IGNORECASE)
+_FPS_HEADER = re.compile(r'fps|frames? per sec', re.IGNORECASE)
+# 1000/x turns the longest frame time into the lowest frame rate, so these trade places
+_EXTREME_SWAP = {'Max FPS': 'Min FPS', 'Min FPS': 'Max FPS'}
+
+class FileFormatError(ValueError):
+    """Raised when an imported file cannot be parsed"""
+
+def read_benchmark_table(buffer, file_extension):
+    """Parse a CSV or TXT buffer into a DataFrame, raising FileFormatError if it cannot be read"""
+    if file_extension == 'csv':
+        # Try to parse as CSV
+        df = pd.read_csv(buffer)
+        return df
+    elif file_extension == 'txt':
+        # Try different parsing strategies for TXT files
+        # Decode straight from the upload's buffer instead of copying it first
+        with buffer.getbuffer() as view:
+            content = str(view, 'utf-8')
+        
+        # Try parsing as CSV first
+        try:
+            df = pd.read_csv(io.StringIO(content))
+            if not df.empty:
+                return df
+        except:
+            pass
+        
+        # Try parsing as TSV
+        try:
+            df = pd.read_csv(io.StringIO(content), sep='\t')
+            if not df.empty:
+                return df
+        except:
+            pass
+        
+        # Try to detect format based on content
+        lines = content.strip().split('\n')
+        if len(lines) > 0:
+            # Try to detect delimiter
+            potential_delimiters = [',', '\t', '|', ';']
+            max_field_count = 0
+            best_delimiter = ','
+            
+            for delimiter in potential_delimiters:
+                field_count = len(lines[0].split(delimiter))
+                if field_count > max_field_count:
+                    max_field_count = field_count
+                    best_delimiter = delimiter
             
-            # Try parsing as TSV
+            # Try to parse with detected delimiter
             try:
-                df = pd.read_csv(io.StringIO(content), sep='\t')
+                df = pd.read_csv(io.StringIO(content), sep=best_delimiter)
                 if not df.empty:
                     return df
             except:
                 pass
             
-            # Try to detect format based on content
-            lines = content.strip().split('\n')
-            if len(lines) > 0:
-                # Try to detect delimiter
-                potential_delimiters = [',', '\t', '|', ';']
-                max_field_count = 0
-                best_delimiter = ','
-                
-                for delimiter in potential_delimiters:
-                    field_count = len(lines[0].split(delimiter))
-                    if field_count > max_field_count:
-                        max_field_count = field_count
-                        best_delimiter = delimiter
+            # Last resort: try custom parsing for different benchmark formats
+            # Try parsing FPS data in custom format (e.g., "Test: Game A - 1080p, Avg FPS: 120.5, 1% Low: 98.3")
+            pattern = _RECORD_PATTERN
+            
+            data = []
+            record = {}
+            
+            for line in lines:
+                if line.strip() == '':
+                    if record:
+                        data.append(record)
+                        record = {}
+                    continue
                 
-                # Try to parse with detected delimiter
+                matches = pattern.findall(line)
+                for key, value in matches:
+                    key = key.strip()
+                    value = value.strip()
+                    record[key] = value
+            
+            # Add the last record if present
+            if record:
+                data.append(record)
+            
+            if data:
+                return pd.DataFrame(data)
+            
+            # Try parsing space-separated data
+            data = []
+            for line in lines:
+                if line.strip() and not line.startswith('#'):
+                    parts = line.split()
+                    if len(parts) >= 2:
+                        try:
+                            # Assume first part is test name, second is score
+                            test_name = parts[0]
+                            score = float(parts[1])
+                            data.append({'Test': test_name, 'Score': score})
+                        except ValueError:
+                            pass
+            
+            if data:
+                return pd.DataFrame(data)
+        
+        # If all else fails
+        raise FileFormatError("Could not parse the file format. Please check the file or try a different file.")
+    else:
+        raise FileFormatError("Unsupported file format. Please upload a CSV or TXT file.")
+
+def _sniff_delimiter(buffer):
+    """Guess the delimiter from the header line, or None for free-form text"""
+    position = buffer.tell()
+    header = buffer.readline()
+    buffer.seek(position)
+    if isinstance(header, bytes):
+        header = header.decode('utf-8', errors='replace')
+
+    if _RECORD_LINE.match(header):
+        # "key: value, key: value" records also contain commas but are not a CSV header
+        return None
+
+    counts = {delimiter: header.count(delimiter) for delimiter in [',', '\t', '|', ';']}
+    best_delimiter = max(counts, key=counts.get)
+    return best_delimiter if counts[best_delimiter] > 0 else None
+
+def iter_table_chunks(buffer, file_extension, chunk_rows=CHUNK_ROWS):
+    """Yield the parsed table as DataFrames of at most chunk_rows rows"""
+    buffer.seek(0)
+    if file_extension == 'csv':
+        sep = ','
+    elif file_extension == 'txt':
+        sep = _sniff_delimiter(buffer)
+        if sep is None:
+            if hasattr(buffer, 'getvalue'):
+                # In-memory uploads use the full set of parsing fallbacks
+                yield read_benchmark_table(buffer, file_extension)
+            else:
+                text = io.TextIOWrapper(buffer, encoding='utf-8')
                 try:
-                    df = pd.read_csv(io.StringIO(content), sep=best_delimiter)
-                    if not df.empty:
-                        return df
-                except:
-                    pass
-                
-                # Last resort: try custom parsing for different benchmark formats
-                # Try parsing FPS data in custom format (e.g., "Test: Game A - 1080p, Avg FPS: 120.5, 1% Low: 98.3")
-                pattern = re.compile(r'([^:,]+):\s*([^,]+)')
-                
-                data = []
-                record = {}
-                
-                for line in lines:
-                    if line.strip() == '':
-                        if record:
-                            data.append(record)
-                            record = {}
-                        continue
-                    
-                    matches = pattern.findall(line)
-                    for key, value in matches:
-                        key = key.strip()
-                        value = value.strip()
-                        record[key] = value
-                
-                # Add the last record if present
+                    yield from _iter_free_form_chunks(text, chunk_rows)
+                finally:
+                    # Leave the underlying file open for the caller
+                    text.detach()
+            return
+    else:
+        raise FileFormatError("Unsupported file format. Please upload a CSV or TXT file.")
+
+    yield from pd.read_csv(buffer, sep=sep, chunksize=chunk_rows)
+
+def _iter_free_form_chunks(lines, chunk_rows):
+    """Stream free-form TXT records line by line, yielding DataFrames of at most chunk_rows rows"""
+    records = []
+    record = {}
+    mode = None
+
+    for line in lines:
+        line = line.rstrip('\r\n')
+        if mode is None:
+            if not line.strip() or line.startswith('#'):
+                continue
+            # The first meaningful line decides between "key: value" records and "name score" rows
+            mode = 'records' if _RECORD_PATTERN.search(line) else 'columns'
+
+        if mode == 'records':
+            if line.strip() == '':
                 if record:
-                    data.append(record)
-                
-                if data:
-                    return pd.DataFrame(data)
-                
-                # Try parsing space-separated data
-                data = []
-                for line in lines:
-                    if line.strip() and not line.startswith('#'):
-                        parts = line.split()
-                        if len(parts) >= 2:
-                            try:
-                                # Assume first part is test name, second is score
-                                test_name = parts[0]
-                                score = float(parts[1])
-                                data.append({'Test': test_name, 'Score': score})
-                            except ValueError:
-                                pass
-                
-                if data:
-                    return pd.DataFrame(data)
-            
-            # If all else fails
-            st.error("Could not parse the file format. Please check the file or try a different file.")
-            return None
+                    records.append(record)
+                    record = {}
+                continue
+            for key, value in _RECORD_PATTERN.findall(line):
+                record[key.strip()] = value.strip()
+        elif line.strip() and not line.startswith('#'):
+            parts = line.split()
+            if len(parts) >= 2:
+                try:
+                    records.append({'Test': parts[0], 'Score': float(parts[1])})
+                except ValueError:
+                    pass
+
+        if len(records) >= chunk_rows:
+            yield pd.DataFrame(records)
+            records = []
+
+    if record:
+        records.append(record)
+    if records:
+        yield pd.DataFrame(records)
+
+def list_import_files(path):
+    """Return the CSV/TXT files at a path, walking directories in sorted order"""
+    if not os.path.isdir(path):
+        return [path]
+
+    files = []
+    for root, dirs, names in os.walk(path):
+        dirs.sort()
+        for name in sorted(names):
+            if name.split('.')[-1].lower() in IMPORT_EXTENSIONS:
+                files.append(os.path.join(root, name))
+    return files
+
+def get_import_root():
+    """Directory server-side imports are confined to, or None when server-path import is disabled"""
+    import_root = os.environ.get('BENCHMARK_IMPORT_ROOT')
+    return os.path.realpath(os.path.expanduser(import_root)) if import_root else None
+
+def check_import_path(path):
+    """Resolve a server-side import path inside BENCHMARK_IMPORT_ROOT; relative paths start from the root"""
+    import_root = get_import_root()
+    if import_root is None:
+        raise FileFormatError("Server path import is disabled. Set BENCHMARK_IMPORT_ROOT to enable it.")
+
+    resolved = os.path.realpath(os.path.join(import_root, os.path.expanduser(path)))
+    if os.path.commonpath([resolved, import_root]) != import_root:
+        raise FileFormatError(f"Imports are restricted to {import_root}")
+    if not os.path.exists(resolved):
+        raise FileFormatError(f"Path not found: {path}")
+    return resolved
+
+class FileTailer:
+    """Follow growing CSV/TXT files, parsing only the bytes appended since the last poll.
+
+    Only complete lines are consumed (complete blank-line separated records for
+    "key: value" files); a partially written tail is left for the next poll.
+    A file that shrinks is assumed to have been replaced and is read again from the start.
+    With from_end=True only the files present when the tail starts are followed
+    from their current end; files that appear later are read in full.
+    """
+
+    def __init__(self, path, from_end=False):
+        self.path = path
+        self.from_end = from_end
+        self._files = {}
+        self._skip_existing = set(list_import_files(path)) if from_end else set()
+
+    def _open_state(self, file_path, size):
+        with open(file_path, 'rb') as f:
+            header = f.readline()
+            if not header.endswith(b'\n'):
+                # Header not fully written yet
+                return None
+            f.seek(0)
+            sep = _sniff_delimiter(f)
+
+            state = {
+                'sep': sep,
+                'header': header if sep else b'',
+                'offset': len(header) if sep else 0,
+                'boundary': b'\n',
+                'skip_partial': False,
+            }
+            if sep is None and _RECORD_LINE.match(header.decode('utf-8', errors='replace')):
+                state['boundary'] = b'\n\n'
+
+            # Only the first open of a file that existed at the start skips its contents
+            if file_path in self._skip_existing and size > state['offset']:
+                # Start at the current end; drop the rest of a line that is still being written
+                f.seek(size - 1)
+                state['skip_partial'] = f.read(1) != b'\n'
+                state['offset'] = size
+        self._skip_existing.discard(file_path)
+        return state
+
+    def _parse(self, state, data):
+        if state['sep']:
+            return pd.read_csv(io.BytesIO(state['header'] + data), sep=state['sep'])
+        chunks = list(_iter_free_form_chunks(io.StringIO(data.decode('utf-8')), CHUNK_ROWS))
+        return pd.concat(chunks, ignore_index=True) if chunks else None
+
+    def poll(self):
+        """Return the rows appended to any followed file since the previous poll"""
+        frames = []
+        for file_path in list_import_files(self.path):
+            size = os.path.getsize(file_path)
+            state = self._files.get(file_path)
+            if state is not None and size < state['offset']:
+                state = None
+            if state is None:
+                state = self._open_state(file_path, size)
+                if state is None:
+                    continue
+                self._files[file_path] = state
+            if size <= state['offset']:
+                continue
+
+            with open(file_path, 'rb') as f:
+                f.seek(state['offset'])
+                data = f.read(size - state['offset'])
+
+            if state['skip_partial']:
+                newline = data.find(b'\n')
+                if newline < 0:
+                    state['offset'] += len(data)
+                    continue
+                state['offset'] += newline + 1
+                data = data[newline + 1:]
+                state['skip_partial'] = False
+
+            end = data.rfind(state['boundary'])
+            if end < 0:
+                continue
+            end += len(state['boundary'])
+            state['offset'] += end
+
+            df = self._parse(state, data[:end])
+            if df is not None and not df.empty:
+                frames.append(df)
+
+        return pd.concat(frames, ignore_index=True) if frames else pd.DataFrame()
+
+def preview_path(path, nrows=100):
+    """Parse only the first rows of the first importable file at a path"""
+    files = list_import_files(path)
+    if not files:
+        raise FileFormatError("No CSV or TXT files found.")
+    with open(files[0], 'rb') as f:
+        return preview_table(f, files[0].split('.')[-1].lower(), nrows)
+
+# Columns that label a result rather than measure it; aggregation groups on them
+LABEL_COLUMNS = ('Test', 'Suite', 'Config')
+
+class RunningMeans:
+    """Fold chunks into per-Test sums and counts, so memory grows with the number of tests rather than rows"""
+
+    def __init__(self):
+        self.sums = None
+        self.counts = None
+
+    def add(self, df):
+        keys = [col for col in LABEL_COLUMNS if col in df.columns]
+        values = df.drop(columns=keys).apply(pd.to_numeric, errors='coerce')
+        # Rows without a Suite or Config still count, under a missing label
+        grouped = values.groupby([df[col] for col in keys], sort=False, dropna=False)
+        sums = grouped.sum()
+        counts = grouped.count()
+        if self.sums is None:
+            self.sums, self.counts = sums, counts
         else:
-            st.error("Unsupported file format. Please upload a CSV or TXT file.")
-            return None
-    except Exception as e:
-        st.error(f"Error parsing file: {str(e)}")
+            self.sums = self.sums.add(sums, fill_value=0)
+            self.counts = self.counts.add(counts, fill_value=0)
+
+    def result(self):
+        if self.sums is None:
+            return pd.DataFrame()
+        means = self.sums / self.counts.where(self.counts > 0)
+        return means.reset_index()
+
+def preview_table(buffer, file_extension, nrows=100):
+    """Parse only the first rows of a file, for previews and column mapping"""
+    try:
+        return next(iter_table_chunks(buffer, file_extension, nrows), None)
+    finally:
+        buffer.seek(0)
+
+def apply_column_mapping(df, mapping):
+    """Build a frame with the mapped FPS columns renamed to their metric names"""
+    new_df = pd.DataFrame(index=df.index)
+    for metric, col in mapping.items():
+        if col != "None" and col in df.columns:
+            new_df[metric] = df[col]
+    return new_df
+
+def _lows_above_average(df):
+    """True if the percentile lows mostly sit above the average (frame times), False if below (FPS)"""
+    lows = [col for col in ('1% Low', '0.1% Low') if col in df.columns]
+    if 'Avg FPS' not in df.columns or not lows:
         return None
+    average = pd.to_numeric(df['Avg FPS'], errors='coerce')
+    vote = np.nansum(np.sign(df[lows].apply(pd.to_numeric, errors='coerce').sub(average, axis=0).to_numpy()))
+    return None if vote == 0 else bool(vote > 0)
+
+def detect_frametime_columns(df, mapping=None):
+    """Return the metric columns that hold milliseconds per frame rather than FPS.
+
+    The source header decides when it names a unit. Columns without one take the
+    unit of those that do, or else are judged from the value ordering: in FPS the
+    percentile lows sit below the average, in frame times above it.
+    """
+    mapping = mapping or {}
+    metrics = [m for m in FPS_METRICS if m in df.columns]
+    units = {}
+    for metric in metrics:
+        header = str(mapping.get(metric, metric))
+        if _MS_HEADER.search(header):
+            units[metric] = 'ms'
+        elif _FPS_HEADER.search(header):
+            units[metric] = 'fps'
+
+    undecided = [m for m in metrics if m not in units]
+    if undecided:
+        declared = set(units.values())
+        if len(declared) == 1:
+            unit = declared.pop()
+        else:
+            unit = 'ms' if _lows_above_average(df) else 'fps'
+        units.update({metric: unit for metric in undecided})
+    return [m for m in metrics if units[m] == 'ms']
+
+def detect_import_units(preview, view_mode, column_mapping):
+    """Decide once per import which mapped metrics hold frame times, judged from the preview rows"""
+    if view_mode != 'FPS' or preview is None:
+        return None
+    return detect_frametime_columns(apply_column_mapping(preview, column_mapping), column_mapping)
+
+def normalize_units(df, mapping=None, frametime_columns=None):
+    """Convert frame-time columns to FPS in one vectorized step.
+
+    Percentiles carry over directly (the 99th percentile frame time is the 1% low),
+    while the max and min columns trade places. Pass frametime_columns to use a
+    decision made once for the whole import instead of detecting it from df.
+    """
+    if frametime_columns is None:
+        columns = detect_frametime_columns(df, mapping)
+    else:
+        columns = [col for col in frametime_columns if col in df.columns]
+    if not columns:
+        return df
+
+    values = df[columns].apply(pd.to_numeric, errors='coerce')
+    converted = 1000 / values.where(values > 0)
+    renames = {col: _EXTREME_SWAP.get(col, col) for col in columns}
+    # A max/min whose swapped name is already present in FPS duplicates that
+    # column under the wrong label, so it is dropped instead
+    dropped = [col for col, new in renames.items() if new != col and new in df.columns and new not in columns]
+    result = df.copy()
+    result[columns] = converted
+    return result.drop(columns=dropped).rename(columns=renames)
+
+def index_scores(df, baseline, columns=('Score',), key='Test', group_column=None):
+    """Express score columns as a percentage of the baseline test's mean score (baseline = 100).
+
+    With group_column (one column or a list) set, each group is indexed to its own
+    baseline rows, so suites on very different scales can be charted together.
+    """
+    score = pd.to_numeric(df[columns[0]], errors='coerce')
+    is_baseline = (df[key] == baseline).to_numpy()
+    if group_column is None:
+        reference = score[is_baseline].mean()
+    else:
+        groups = [df[col] for col in np.atleast_1d(group_column)]
+        reference = score.where(is_baseline).groupby(groups, observed=True).transform('mean')
+
+    result = df.copy()
+    result[list(columns)] = df[list(columns)].apply(pd.to_numeric, errors='coerce').div(reference, axis=0) * 100
+    return result
+
+def prepare_points_frame(df):
+    """Reduce a frame to Test, Score and sub-score columns, or return None if they cannot be identified.
+
+    The overall score is a 'Score', 'Overall' or 'Total' column, else the first
+    column after Test; every other numeric column is kept as a sub-score.
+    """
+    if 'Test' not in df.columns and len(df.columns) >= 2:
+        first, second = df.columns[0], df.columns[1]
+        if (normalize_header(first) in _SUITE_HEADERS and len(df.columns) >= 3
+                and pd.to_numeric(df[second], errors='coerce').isna().all()):
+            # "Benchmark, CPU, scores..." files: label each test with its suite and system
+            df = df.assign(Test=df[first].astype(str) + ' - ' + df[second].astype(str)).drop(columns=[second])
+        else:
+            # Try to guess: first column is often the test name
+            df = df.rename(columns={first: 'Test'})
+
+    suite = next((col for col in df.columns if col != 'Test' and normalize_header(col) in _SUITE_HEADERS), None)
+    candidates = [col for col in df.columns if col not in ('Test', suite)]
+    if 'Score' not in df.columns and candidates:
+        overall = next((col for col in candidates if _OVERALL_HEADER.search(str(col))), candidates[0])
+        df = df.rename(columns={overall: 'Score'})
+        candidates = ['Score' if col == overall else col for col in candidates]
+
+    if 'Test' not in df.columns or 'Score' not in df.columns:
+        return None
+
+    numeric = df[candidates].apply(pd.to_numeric, errors='coerce')
+    sub_scores = [col for col in candidates if col != 'Score' and numeric[col].notna().any()]
+    result = pd.DataFrame({'Test': df['Test']})
+    if suite is not None:
+        result['Suite'] = df[suite]
+    result['Score'] = df['Score']
+    for col in sub_scores:
+        result[f'{SUB_SCORE_PREFIX}{col}'] = numeric[col]
+    return result
+
+def normalize_chunk(chunk, view_mode, column_mapping, config_label=None, frametime_columns=None):
+    """Map one parsed chunk onto the columns of the results table for the current view mode"""
+    new_df = _map_chunk(chunk, view_mode, column_mapping, frametime_columns)
+    if config_label:
+        # Tag the rows with the hardware/driver configuration they were measured on
+        new_df['Config'] = config_label
+    return new_df
+
+def _map_chunk(chunk, view_mode, column_mapping, frametime_columns=None):
+    if view_mode == 'FPS':
+        mapping = column_mapping
+        if not all(col in chunk.columns for col in mapping.values() if col != "None"):
+            # A file with a different header than the one that was mapped: use its
+            # saved profile, or a fuzzy guess if the header has not been seen before,
+            # and judge its units from its own headers and rows
+            mapping, _ = resolve_column_mapping(chunk.columns.tolist())
+            frametime_columns = None
+        new_df = apply_column_mapping(chunk, mapping)
+        if 'Test' not in new_df.columns or len(new_df.columns) < 2:
+            raise ValueError("Need at least Test column and one metric.")
+        # Tools that report frame times are converted so every source charts in FPS
+        return normalize_units(new_df, mapping, frametime_columns)
+
+    new_df = prepare_points_frame(chunk)
+    if new_df is None:
+        raise ValueError("Could not identify Test and Score columns.")
+    return new_df
+
+def get_session_id():
+    """Id of the browser session running this script, used as the owner of shared cache entries"""
+    ctx = get_script_run_ctx()
+    return ctx.session_id if ctx is not None else None
+
+def get_history():
+    """Return the session's dataset history, starting it from the current results on first use"""
+    if 'history' not in st.session_state:
+        st.session_state.history = DatasetHistory(st.session_state.get('tests'), owner=get_session_id())
+    return st.session_state.history
+
+def sync_results():
+    """Point the results table and data version at the history's current version"""
+    history = get_history()
+    # The history's frame is one object shared across sessions; each session gets
+    # its own shallow copy, so in-place operations can't reach other sessions and
+    # writes copy the columns they touch instead of failing on the read-only data
+    st.session_state.tests = history.frame.copy(deep=False)
+    # Keyed on content, so sessions viewing the same data share cached results
+    st.session_state.data_version = history.head.key
 
 def save_session_data():
     """Save session data to the session state storage"""
-    # Convert DataFrame to JSON for storage
-    if not st.session_state.tests.empty:
-        # Store the data in the session state
-        st.session_state.data_json = st.session_state.tests.to_json(orient='split')
-        
-        # Create a timestamp for the last save
+    # The history already holds the data as handles into the shared cache, so
+    # there is no private serialized copy to refresh; only note when it changed
+    if st.session_state.get('saved_version') != st.session_state.data_version:
         st.session_state.last_saved = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        st.session_state.saved_version = st.session_state.data_version
 
 def load_session_data():
     """Load session data from the session state storage"""
-    if 'data_json' in st.session_state and st.session_state.data_json:
-        try:
-            # Load data from the session state
-            st.session_state.tests = pd.read_json(st.session_state.data_json, orient='split')
-        except Exception as e:
-            st.error(f"Error loading session data: {str(e)}")
-            st.session_state.tests = pd.DataFrame()
+    sync_results()
 
 def export_to_csv(df):
     """Export the DataFrame to a CSV file"""
@@ -155,6 +586,9 @@ def export_to_csv(df):
 
 def export_to_png():
     """Export current chart as a PNG image"""
+    # Loaded on first use: the export stack is rarely needed on a rerun
+    import plotly.graph_objects as go
+
     try:
         for key, val in st.session_state.items():
             if isinstance(val, go.Figure):
@@ -176,6 +610,10 @@ def export_to_png():
 def export_to_pdf(df):
     """Export the data and charts to a PDF report"""
     if not df.empty:
+        # Loaded on first use: fpdf is only needed for PDF reports
+        import tempfile
+        from fpdf import FPDF
+
         try:
             # Create a FPDF object
             pdf = FPDF()
@@ -0,0 +1,100 @@
+import numpy as np
+import pandas as pd
+
+# Column names used by common capture tools (PresentMon, CapFrameX, OCAT, FrameView), lower-cased
+FRAMETIME_COLUMNS = ['msbetweenpresents', 'frametime', 'frame time', 'frametime (ms)', 'frame time (ms)',
+                     'msbetweendisplaychange', 'ms']
+HISTOGRAM_BINS = 200
+# Frametime (ms) sampled at these percentiles for the percentile curve
+PERCENTILE_GRID = np.round(np.linspace(0, 100, 1001), 1)
+# A frame counts as a stutter when it takes longer than this many times the median frametime
+STUTTER_MULTIPLIERS = (2.0, 2.5, 3.0, 4.0)
+
+def _find_frametime_column(columns):
+    lookup = {str(col).strip().lower(): col for col in columns}
+    for name in FRAMETIME_COLUMNS:
+        if name in lookup:
+            return lookup[name]
+    return None
+
+def _is_number(value):
+    try:
+        float(value)
+    except (TypeError, ValueError):
+        return False
+    return True
+
+def read_frametimes(buffer):
+    """Read per-frame times in milliseconds from a capture log"""
+    header = pd.read_csv(buffer, nrows=0)
+    buffer.seek(0)
+    column = _find_frametime_column(header.columns)
+    header_row = 0
+    if column is None:
+        if len(header.columns) != 1:
+            raise ValueError("No frametime column found (expected e.g. MsBetweenPresents or Frametime).")
+        column = header.columns[0]
+        if _is_number(column):
+            # A bare list of frametimes has no header; its first line is a frame
+            column, header_row = 0, None
+
+    # Only the frametime column is materialized, parsed straight to float32
+    try:
+        frames = pd.read_csv(buffer, header=header_row, usecols=[column], dtype={column: np.float32})[column]
+    except ValueError:
+        # Non-numeric entries (e.g. a trailing summary line) are skipped below
+        buffer.seek(0)
+        frames = pd.read_csv(buffer, header=header_row, usecols=[column])[column]
+        frames = pd.to_numeric(frames, errors='coerce')
+    frames = frames.to_numpy(dtype=np.float32)
+    frames = frames[np.isfinite(frames) & (frames > 0)]
+    if frames.size == 0:
+        raise ValueError("The frametime column contains no valid values.")
+    return frames
+
+def _sorted_percentiles(ordered, percentiles):
+    """Linearly interpolated percentiles of an already sorted array"""
+    position = np.asarray(percentiles) / 100 * (ordered.size - 1)
+    lower = np.floor(position).astype(np.intp)
+    upper = np.minimum(lower + 1, ordered.size - 1)
+    fraction = position - lower
+    return ordered[lower] * (1 - fraction) + ordered[upper] * fraction
+
+def summarize_frametimes(frames):
+    """Precompute the binned summaries the frametime charts are drawn from.
+
+    The raw frames are scanned once here (one sort, one histogram); charts only
+    read the returned dict, however many frames the run has.
+    """
+    ordered = np.sort(frames.astype(np.float64))
+    median, p99, p999 = (float(v) for v in _sorted_percentiles(ordered, [50, 99, 99.9]))
+    curve = _sorted_percentiles(ordered, PERCENTILE_GRID)
+
+    # Bin up to past the 99.9th percentile; longer frames are reported as overflow
+    upper = max(p999, median * 2) * 1.25
+    counts, edges = np.histogram(ordered, bins=HISTOGRAM_BINS, range=(0.0, upper))
+    overflow = int(ordered.size - np.searchsorted(ordered, upper, side='right'))
+
+    # Sorted frames make every threshold count a binary search
+    stutter = {multiplier: int(ordered.size - np.searchsorted(ordered, median * multiplier, side='right'))
+               for multiplier in STUTTER_MULTIPLIERS}
+
+    total_ms = float(ordered.sum())
+    return {
+        'frames': int(ordered.size),
+        'duration_s': total_ms / 1000,
+        'median_ms': median,
+        'hist_counts': counts,
+        'hist_edges': edges,
+        'hist_overflow': overflow,
+        'percentiles': PERCENTILE_GRID,
+        'percentile_ms': curve,
+        'stutter': stutter,
+        'metrics': {
+            'Avg FPS': ordered.size * 1000 / total_ms,
+            '1% Low': 1000 / p99,
+            'Max FPS': 1000 / float(ordered[0]),
+            'Min FPS': 1000 / float(ordered[-1]),
+            '0.1% Low': 1000 / p999,
+        },
+    }
@@ -0,0 +1,276 @@
+import itertools
+from collections import namedtuple
+
+import numpy as np
+import pandas as pd
+
+from shared_cache import shared_cache, content_key, array_nbytes, frame_nbytes
+
+# Rows per column chunk; appends fill the last chunk before starting a new one
+HISTORY_CHUNK_ROWS = 16_384
+# Versions kept for undo, including the current one
+MAX_VERSIONS = 50
+
+# Version ids number the entries of every history in the process; caches key on
+# Version.key instead, so sessions holding the same content share their results
+_version_ids = itertools.count(1)
+
+# kind is 'load', 'append', 'update' or 'clear'; rows is a (start, stop) range
+# for appends and the changed row positions for updates
+Change = namedtuple('Change', ['kind', 'label', 'rows'])
+
+def _freeze(values):
+    """Copy values into a read-only array so no frame can write through to a shared chunk"""
+    chunk = np.array(values, copy=True)
+    chunk.flags.writeable = False
+    return chunk
+
+def _intern(values, owner):
+    """Store a chunk in the shared cache; identical chunks from any session share one array"""
+    return shared_cache.acquire(content_key(values), lambda: _freeze(values), owner, array_nbytes)
+
+def _fill(chunk, size):
+    """A chunk of a column that did not exist yet is stored as None and read as NaN"""
+    return np.full(size, np.nan) if chunk is None else chunk.value
+
+def _chunk_key(chunk):
+    return None if chunk is None else chunk.key
+
+def _offsets(sizes):
+    return np.concatenate(([0], np.cumsum(sizes, dtype=np.int64)))
+
+class Version:
+    """An immutable snapshot of the results table.
+
+    Each column is a tuple of handles to read-only chunks aligned to `sizes`. A
+    new version reuses every chunk its change did not touch, so it costs only
+    its change set. `key` identifies the content, whichever session built it.
+    """
+
+    __slots__ = ('id', 'key', 'columns', 'sizes', 'change', '_frame')
+
+    def __init__(self, columns, sizes, change):
+        self.id = next(_version_ids)
+        self.columns = columns
+        self.sizes = tuple(sizes)
+        self.change = change
+        self.key = content_key([(name, [_chunk_key(c) for c in chunks]) for name, chunks in columns.items()],
+                               self.sizes)
+        self._frame = None
+
+    def __len__(self):
+        return sum(self.sizes)
+
+    def column(self, name, start=0, stop=None):
+        """Materialize rows start:stop of one column, reading only the chunks that overlap them"""
+        stop = len(self) if stop is None else stop
+        offsets = _offsets(self.sizes)
+        chunks = self.columns.get(name, (None,) * len(self.sizes))
+        first = max(np.searchsorted(offsets, start, side='right') - 1, 0)
+        last = np.searchsorted(offsets, stop, side='left')
+        parts = [_fill(chunks[i], self.sizes[i])[max(start - offsets[i], 0):stop - offsets[i]]
+                 for i in range(first, last)]
+        return np.concatenate(parts) if parts else np.empty(0)
+
+    def to_frame(self, start=0, stop=None):
+        """Rows start:stop as a DataFrame over read-only column arrays, so writes to it raise"""
+        columns = {}
+        for name in self.columns:
+            values = self.column(name, start, stop)
+            values.flags.writeable = False
+            columns[name] = values
+        # copy=False keeps the read-only arrays instead of consolidating them into writable blocks
+        frame = pd.DataFrame(columns, copy=False)
+        frame.index += start
+        return frame
+
+def _from_frame(df, change, owner):
+    if df is None or df.empty:
+        return Version({}, (), change)
+    sizes = [min(HISTORY_CHUNK_ROWS, len(df) - start) for start in range(0, len(df), HISTORY_CHUNK_ROWS)]
+    columns = {}
+    for name in df.columns:
+        values = df[name].to_numpy()
+        columns[name] = tuple(_intern(values[start:start + HISTORY_CHUNK_ROWS], owner)
+                              for start in range(0, len(df), HISTORY_CHUNK_ROWS))
+    return Version(columns, sizes, change)
+
+class DatasetHistory:
+    """Undoable history of the results table built from structurally shared versions.
+
+    Appends copy only the new rows (plus the partly filled last chunk) and value
+    updates copy only the chunks they change; everything else is shared with
+    the previous version. Chunks and the materialized frame live in the shared
+    cache under `owner`; the oldest versions are dropped when the owner goes
+    over its session cap.
+    """
+
+    def __init__(self, df=None, max_versions=MAX_VERSIONS, owner=None):
+        self.max_versions = max_versions
+        self.owner = owner
+        self._versions = [_from_frame(df, Change('load', "Loaded data", None), owner)]
+        self._head = 0
+
+    @property
+    def head(self):
+        return self._versions[self._head]
+
+    @property
+    def version(self):
+        return self.head.id
+
+    @property
+    def frame(self):
+        """The current version as a read-only DataFrame, shared with every session holding the same content.
+
+        The object itself is shared, so it must never be modified in place; hand
+        sessions a shallow copy (see sync_results) instead.
+        """
+        head = self.head
+        if head._frame is None:
+            head._frame = shared_cache.acquire(('frame', head.key), head.to_frame, self.owner, frame_nbytes)
+        return head._frame.value
+
+    @property
+    def can_undo(self):
+        return self._head > 0
+
+    @property
+    def can_redo(self):
+        return self._head < len(self._versions) - 1
+
+    def entries(self):
+        """(id, change) of every retained version, oldest first"""
+        return [(v.id, v.change) for v in self._versions]
+
+    def get(self, version_id):
+        for v in self._versions:
+            if v.id == version_id:
+                return v
+        raise KeyError(f"Version {version_id} is no longer in the history.")
+
+    def _move(self, head):
+        # Only the current version keeps its materialized frame
+        self.head._frame = None
+        self._head = head
+
+    def _commit(self, version):
+        del self._versions[self._head + 1:]
+        self._versions.append(version)
+        self._move(len(self._versions) - 1)
+        while len(self._versions) > 1 and (len(self._versions) > self.max_versions
+                                           or shared_cache.over_session_cap(self.owner)):
+            del self._versions[0]
+            self._head -= 1
+        return version
+
+    def undo(self):
+        if self.can_undo:
+            self._move(self._head - 1)
+        return self.head
+
+    def redo(self):
+        if self.can_redo:
+            self._move(self._head + 1)
+        return self.head
+
+    def append(self, rows, label):
+        """Add rows at the end; only the last, partly filled chunk of each column is copied"""
+        base = self.head
+        n_new = len(rows)
+        if n_new == 0:
+            return base
+
+        n_old = len(base)
+        sizes = list(base.sizes)
+        fill = 0
+        if sizes and sizes[-1] < HISTORY_CHUNK_ROWS:
+            fill = min(HISTORY_CHUNK_ROWS - sizes[-1], n_new)
+        pieces = [fill] if fill else []
+        pieces += [min(HISTORY_CHUNK_ROWS, n_new - start) for start in range(fill, n_new, HISTORY_CHUNK_ROWS)]
+
+        columns = {}
+        for name in list(base.columns) + [c for c in rows.columns if c not in base.columns]:
+            chunks = list(base.columns.get(name, (None,) * len(sizes)))
+            values = rows[name].to_numpy() if name in rows.columns else None
+            if fill:
+                tail = chunks.pop()
+                if tail is None and values is None:
+                    chunks.append(None)
+                else:
+                    new = np.full(fill, np.nan) if values is None else values[:fill]
+                    chunks.append(_intern(np.concatenate([_fill(tail, sizes[-1]), new]), self.owner))
+            for start in range(fill, n_new, HISTORY_CHUNK_ROWS):
+                chunks.append(None if values is None
+                              else _intern(values[start:start + HISTORY_CHUNK_ROWS], self.owner))
+            columns[name] = tuple(chunks)
+
+        if fill:
+            sizes[-1] += fill
+        sizes += pieces[1:] if fill else pieces
+        return self._commit(Version(columns, sizes, Change('append', label, (n_old, n_old + n_new))))
+
+    def replace_values(self, column, old_value, new_value, label):
+        """Set every `old_value` in a column to `new_value`, copying only the chunks that contain it"""
+        base = self.head
+        if column not in base.columns:
+            return base
+
+        offsets = _offsets(base.sizes)
+        chunks, changed = [], []
+        for i, chunk in enumerate(base.columns[column]):
+            values = _fill(chunk, base.sizes[i])
+            hits = np.flatnonzero(values == old_value)
+            if hits.size:
+                updated = values.astype(object)
+                updated[hits] = new_value
+                chunk = _intern(updated, self.owner)
+                changed.append(hits + offsets[i])
+            chunks.append(chunk)
+        if not changed:
+            return base
+
+        columns = dict(base.columns)
+        columns[column] = tuple(chunks)
+        rows = np.concatenate(changed)
+        return self._commit(Version(columns, base.sizes, Change('update', label, rows)))
+
+    def clear(self, label="Cleared data"):
+        return self._commit(Version({}, (), Change('clear', label, None)))
+
+    def diff(self, old_id, new_id):
+        """Rows added, rows removed and cells changed going from one version to another.
+
+        Rows are matched by position. Chunks with the same content key at the same
+        offset are skipped without being read, so diffing neighbouring versions
+        only touches their change.
+        """
+        old, new = self.get(old_id), self.get(new_id)
+        common = min(len(old), len(new))
+        old_offsets, new_offsets = _offsets(old.sizes), _offsets(new.sizes)
+        bounds = np.union1d(old_offsets, new_offsets)
+        bounds = np.union1d(bounds[bounds < common], [common]) if common else np.empty(0)
+
+        changed = []
+        for name in list(old.columns) + [c for c in new.columns if c not in old.columns]:
+            old_chunks = old.columns.get(name, (None,) * len(old.sizes))
+            new_chunks = new.columns.get(name, (None,) * len(new.sizes))
+            for start, stop in zip(bounds[:-1], bounds[1:]):
+                i = np.searchsorted(old_offsets, start, side='right') - 1
+                j = np.searchsorted(new_offsets, start, side='right') - 1
+                if _chunk_key(old_chunks[i]) == _chunk_key(new_chunks[j]) and old_offsets[i] == new_offsets[j]:
+                    continue
+                a = _fill(old_chunks[i], old.sizes[i])[start - old_offsets[i]:stop - old_offsets[i]]
+                b = _fill(new_chunks[j], new.sizes[j])[start - new_offsets[j]:stop - new_offsets[j]]
+                differs = (a != b) & ~(pd.isna(a) & pd.isna(b))
+                hits = np.flatnonzero(differs)
+                if hits.size:
+                    changed.append(pd.DataFrame({'Row': hits + start, 'Column': name,
+                                                 'Old': a[hits], 'New': b[hits]}))
+
+        columns = ['Row', 'Column', 'Old', 'New']
+        return {
+            'added': new.to_frame(common),
+            'removed': old.to_frame(common),
+            'changed': pd.concat(changed, ignore_index=True) if changed else pd.DataFrame(columns=columns),
+        }
@@ -0,0 +1,96 @@
+import ast
+import os
+import subprocess
+import sys
+
+_APP_DIR = os.path.dirname(os.path.abspath(__file__))
+
+def _app_modules(script='app.py'):
+    """Local modules imported at the top level of the app script, in import order"""
+    with open(os.path.join(_APP_DIR, script), encoding='utf-8') as f:
+        tree = ast.parse(f.read())
+    modules = []
+    for node in tree.body:
+        if isinstance(node, ast.Import):
+            names = [alias.name for alias in node.names]
+        elif isinstance(node, ast.ImportFrom) and not node.level:
+            names = [node.module]
+        else:
+            continue
+        for name in names:
+            name = name.split('.')[0]
+            if name not in modules and os.path.exists(os.path.join(_APP_DIR, f'{name}.py')):
+                modules.append(name)
+    return modules
+
+# Modules imported by every script run of app.py
+APP_MODULES = _app_modules()
+
+# Heavy dependencies that must only load on first use
+LAZY_MODULES = ['fpdf', 'PIL', 'requests', 'plotly.express']
+
+# Target import time (ms) for a fresh worker importing all app modules
+COLD_START_BUDGET_MS = 2500.0
+
+def _run_importtime(modules):
+    """Import modules in a fresh interpreter and return the -X importtime log and loaded modules"""
+    code = (
+        "import sys\n"
+        f"for name in {modules!r}:\n"
+        "    __import__(name)\n"
+        "print('\\n'.join(sorted(sys.modules)))\n"
+    )
+    result = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', code],
+        cwd=_APP_DIR,
+        capture_output=True,
+        text=True,
+    )
+    if result.returncode != 0:
+        raise RuntimeError(f"Importing {', '.join(modules)} failed:\n{result.stderr}")
+    return result.stderr, set(result.stdout.split())
+
+def _parse_importtime(log):
+    """Parse -X importtime output into {module: cumulative ms} for top-level imports"""
+    timings = {}
+    for line in log.splitlines():
+        if not line.startswith('import time:') or 'cumulative' in line:
+            continue
+        _, cumulative_us, name = line[len('import time:'):].split('|')
+        # Nested imports are indented below the module that triggered them
+        if not name.startswith('  '):
+            timings[name.strip()] = int(cumulative_us) / 1000.0
+    return timings
+
+def measure_import_times(modules=None):
+    """Measure the cold import cost (ms) of each app module in its own fresh interpreter"""
+    modules = modules or APP_MODULES
+    report = {}
+    for name in modules:
+        log, _ = _run_importtime([name])
+        report[name] = _parse_importtime(log).get(name, 0.0)
+    return report
+
+def check_cold_start_budget(budget_ms=COLD_START_BUDGET_MS):
+    """Check that a fresh worker imports all app modules within budget without loading lazy modules.
+
+    Returns a tuple (total_ms, eagerly_loaded_lazy_modules, within_budget).
+    """
+    log, loaded = _run_importtime(APP_MODULES)
+    timings = _parse_importtime(log)
+    total_ms = sum(timings.get(name, 0.0) for name in APP_MODULES)
+
+    # Streamlit may load some of these itself; only count the ones our modules add
+    _, baseline = _run_importtime(['streamlit'])
+    eager = [name for name in LAZY_MODULES if name in loaded and name not in baseline]
+    return total_ms, eager, total_ms <= budget_ms and not eager
+
+if __name__ == '__main__':
+    for module, ms in measure_import_times().items():
+        print(f"{module:<16} {ms:8.1f} ms")
+
+    total_ms, eager, ok = check_cold_start_budget()
+    print(f"{'cold start':<16} {total_ms:8.1f} ms (budget {COLD_START_BUDGET_MS:.0f} ms)")
+    if eager:
+        print(f"Loaded eagerly: {', '.join(eager)}")
+    sys.exit(0 if ok else 1)
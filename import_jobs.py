@@ -0,0 +1,146 @@
+import os
+import threading
+
+import pandas as pd
+
+from data_handler import (
+    CHUNK_ROWS,
+    RunningMeans,
+    detect_import_units,
+    iter_table_chunks,
+    list_import_files,
+    normalize_chunk
+)
+
+class ImportCancelled(Exception):
+    """Raised inside the worker when the user cancels an import"""
+
+class ImportJob:
+    """Parse, normalize and merge an imported file on a background thread.
+
+    The worker never touches Streamlit: the script thread polls status,
+    progress and rows_read, and picks up new_rows once status is 'done'.
+    """
+
+    def __init__(self, name, buffer, file_extension, view_mode, column_mapping,
+                 size=None, chunk_rows=CHUNK_ROWS, config_label=None, frametime_columns=None):
+        self.name = name
+        self.buffer = buffer
+        self.file_extension = file_extension
+        self.view_mode = view_mode
+        self.column_mapping = dict(column_mapping)
+        self.size = size
+        self.chunk_rows = chunk_rows
+        self.config_label = config_label
+        # Units are decided once (from the preview, or else the first chunk) so every chunk converts alike
+        self.frametime_columns = frametime_columns
+
+        self.status = 'pending'
+        self.progress = 0.0
+        self.rows_read = 0
+        self.chunks_read = 0
+        self.new_rows = None
+        self.error = None
+
+        self._frames = []
+        self._cancel_event = threading.Event()
+        self._thread = threading.Thread(target=self._run, name=f"import-{name}", daemon=True)
+
+    @property
+    def running(self):
+        return self.status in ('pending', 'running')
+
+    def start(self):
+        self.status = 'running'
+        self._thread.start()
+        return self
+
+    def cancel(self):
+        self._cancel_event.set()
+
+    def _iter_chunks(self):
+        yield from iter_table_chunks(self.buffer, self.file_extension, self.chunk_rows)
+
+    def _normalize(self, chunk):
+        """Map one parsed chunk onto the columns of the results table"""
+        if self.frametime_columns is None:
+            self.frametime_columns = detect_import_units(chunk, self.view_mode, self.column_mapping)
+        return normalize_chunk(chunk, self.view_mode, self.column_mapping, self.config_label,
+                               self.frametime_columns)
+
+    def _add(self, new_df):
+        self._frames.append(new_df)
+
+    def _collect(self):
+        if not self._frames:
+            raise ValueError("The file contains no rows.")
+        return pd.concat(self._frames, ignore_index=True)
+
+    def _update_progress(self):
+        if self.size:
+            self.progress = min(self.buffer.tell() / self.size, 1.0)
+
+    def _run(self):
+        try:
+            for chunk in self._iter_chunks():
+                if self._cancel_event.is_set():
+                    raise ImportCancelled()
+                self._add(self._normalize(chunk))
+                self.rows_read += len(chunk)
+                self.chunks_read += 1
+                self._update_progress()
+
+            self.new_rows = self._collect()
+            self._frames = []
+            self.progress = 1.0
+            self.status = 'done'
+        except ImportCancelled:
+            self.status = 'cancelled'
+        except Exception as e:
+            self.error = str(e)
+            self.status = 'failed'
+
+class PathImportJob(ImportJob):
+    """Import a file or directory from the server's disk in fixed-size chunks.
+
+    With aggregate=True each chunk is folded into per-Test means as soon as it
+    is read, so peak memory is bounded by the chunk size rather than the file size.
+    """
+
+    def __init__(self, path, view_mode, column_mapping, aggregate=True, chunk_rows=CHUNK_ROWS,
+                 config_label=None, frametime_columns=None):
+        self.path = path
+        self.files = list_import_files(path)
+        self.aggregate = aggregate
+        self._means = RunningMeans()
+        self._done_bytes = 0
+        super().__init__(os.path.basename(path.rstrip(os.sep)) or path, None, None, view_mode,
+                         column_mapping,
+                         size=sum(os.path.getsize(f) for f in self.files), chunk_rows=chunk_rows,
+                         config_label=config_label, frametime_columns=frametime_columns)
+
+    def _iter_chunks(self):
+        for file_path in self.files:
+            with open(file_path, 'rb') as f:
+                self.buffer = f
+                yield from iter_table_chunks(f, file_path.split('.')[-1].lower(), self.chunk_rows)
+            self._done_bytes += os.path.getsize(file_path)
+            self.buffer = None
+
+    def _update_progress(self):
+        if self.size:
+            current = self.buffer.tell() if self.buffer is not None else 0
+            self.progress = min((self._done_bytes + current) / self.size, 1.0)
+
+    def _add(self, new_df):
+        if self.aggregate:
+            self._means.add(new_df)
+        else:
+            super()._add(new_df)
+
+    def _collect(self):
+        if self.aggregate:
+            if self._means.sums is None:
+                raise ValueError("The path contains no rows.")
+            return self._means.result()
+        return super()._collect()
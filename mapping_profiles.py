@@ -0,0 +1,126 @@
+import hashlib
+import json
+import os
+import re
+import tempfile
+import threading
+from datetime import datetime
+from functools import lru_cache
+
+MAPPED_METRICS = ['Test', 'Avg FPS', '1% Low', 'Max FPS', 'Min FPS', '0.1% Low']
+
+# Where confirmed mappings are kept between server restarts
+PROFILE_PATH = os.environ.get('BENCHMARK_MAPPING_PROFILES',
+                              os.path.join(os.path.expanduser('~'), '.benchmark_visualizer', 'mapping_profiles.json'))
+
+# Fuzzy patterns for each metric, tried against normalized headers ("Avg_FPS" -> "avg fps").
+# They are combined into one regex so each header is classified in a single search.
+_FRAMETIME = r'\b(?:frame ?times?|ms)\b'
+_METRIC_PATTERNS = {
+    'Test': r'\b(?:test|name|label|benchmark|scene|game|title)\b',
+    'Avg FPS': rf'\b(?:avg|average|mean)\b.*(?:\bfps\b|{_FRAMETIME})|(?:\bfps\b|{_FRAMETIME}).*\b(?:avg|average|mean)\b'
+               r'|^fps$|^frame ?times?(?: \(?ms\)?)?$',
+    '0.1% Low': r'0?\.1 ?%.*\blows?\b|\blows?\b.*0?\.1 ?%|^p0\.?1$',
+    '1% Low': r'(?<![\d.])1 ?%.*\blows?\b|\blows?\b.*(?<![\d.])1 ?%|^p1$|\b1(?:st)? percentile\b',
+    # Frame-time extremes map to the FPS metric of the same name; normalize_units swaps them
+    'Max FPS': rf'\bmax(?:imum)?\b.*(?:\bfps\b|{_FRAMETIME})|(?:\bfps\b|{_FRAMETIME}).*\bmax(?:imum)?\b',
+    'Min FPS': rf'\bmin(?:imum)?\b.*(?:\bfps\b|{_FRAMETIME})|(?:\bfps\b|{_FRAMETIME}).*\bmin(?:imum)?\b',
+}
+_GROUP_METRICS = {f'm{i}': metric for i, metric in enumerate(_METRIC_PATTERNS)}
+_MATCHER = re.compile('|'.join(f'(?P<{group}>{_METRIC_PATTERNS[metric]})'
+                               for group, metric in _GROUP_METRICS.items()))
+_SEPARATORS = re.compile(r'[\s_\-]+')
+
+def normalize_header(name):
+    """Lower-case a header and collapse separators, so 'Avg_FPS ' and 'avg fps' compare equal"""
+    return _SEPARATORS.sub(' ', str(name).replace('\ufeff', '')).strip().lower()
+
+def header_signature(columns):
+    """Hash of the normalized header row; files with the same columns in any order share it"""
+    names = sorted(normalize_header(col) for col in columns)
+    return hashlib.blake2b('\x1f'.join(names).encode('utf-8'), digest_size=8).hexdigest()
+
+@lru_cache(maxsize=256)
+def _guess(columns):
+    mapping = {}
+    normalized = [normalize_header(col) for col in columns]
+    exact = {normalize_header(metric): metric for metric in MAPPED_METRICS}
+    for col, name in zip(columns, normalized):
+        if name in exact:
+            mapping[exact[name]] = col
+    for col, name in zip(columns, normalized):
+        if col in mapping.values():
+            continue
+        match = _MATCHER.search(name)
+        if match:
+            mapping.setdefault(_GROUP_METRICS[match.lastgroup], col)
+    return {metric: mapping[metric] for metric in MAPPED_METRICS if metric in mapping}
+
+def guess_column_mapping(cols):
+    """Guess which columns hold the Test label and each FPS metric"""
+    return dict(_guess(tuple(cols)))
+
+class MappingProfileStore:
+    """Confirmed column mappings keyed by header signature, persisted as JSON.
+
+    Mappings are stored against normalized headers, so a file whose headers only
+    differ in case or separators resolves to its own column names.
+    """
+
+    def __init__(self, path=PROFILE_PATH):
+        self.path = path
+        self._profiles = None
+        self._lock = threading.Lock()
+
+    def _load(self):
+        if self._profiles is None:
+            try:
+                with open(self.path, encoding='utf-8') as f:
+                    self._profiles = json.load(f)
+            except (OSError, ValueError):
+                self._profiles = {}
+        return self._profiles
+
+    def _write(self):
+        directory = os.path.dirname(self.path) or '.'
+        os.makedirs(directory, exist_ok=True)
+        # Written to a temporary file first so a crash never leaves a truncated store
+        fd, tmp_path = tempfile.mkstemp(dir=directory, suffix='.tmp')
+        with os.fdopen(fd, 'w', encoding='utf-8') as f:
+            json.dump(self._profiles, f, indent=2)
+        os.replace(tmp_path, self.path)
+
+    def get(self, columns):
+        """Return the saved mapping for this header row, or None if it has not been seen"""
+        with self._lock:
+            profile = self._load().get(header_signature(columns))
+        if profile is None:
+            return None
+        lookup = {normalize_header(col): col for col in columns}
+        return {metric: lookup[name] for metric, name in profile['mapping'].items() if name in lookup}
+
+    def save(self, columns, mapping):
+        columns = list(columns)
+        profile = {
+            'columns': [normalize_header(col) for col in columns],
+            'mapping': {metric: normalize_header(col) for metric, col in mapping.items()
+                        if col != "None" and col in columns},
+            'updated': datetime.now().isoformat(timespec='seconds'),
+        }
+        with self._lock:
+            self._load()[header_signature(columns)] = profile
+            self._write()
+
+    def forget(self, columns):
+        with self._lock:
+            if self._load().pop(header_signature(columns), None) is not None:
+                self._write()
+
+def resolve_column_mapping(columns, store=None):
+    """Return (mapping, True) from a saved profile, or (guessed mapping, False)"""
+    mapping = (store or profile_store).get(columns)
+    if mapping is not None:
+        return mapping, True
+    return guess_column_mapping(columns), False
+
+profile_store = MappingProfileStore()
@@ -0,0 +1,159 @@
+import argparse
+import sys
+
+import numpy as np
+import pandas as pd
+
+REGRESSION_METRICS = ['Avg FPS', '1% Low', 'Max FPS', 'Min FPS', '0.1% Low', 'Score']
+DEFAULT_WINDOW = 5
+# Relative drop below the rolling baseline that flags a run
+DEFAULT_THRESHOLD = 0.05
+# Runs needed in the window before a baseline is trusted
+DEFAULT_MIN_HISTORY = 3
+
+FLAG_COLUMNS = ['Test', 'Run', 'Metric', 'Value', 'Baseline', 'Change %']
+
+def _rolling_baselines(codes, values, window):
+    """Mean, std and count of each row's previous `window` runs within its group.
+
+    Rows are in run order; windows come from prefix sums over the rows sorted by
+    group, so every row and metric is handled in one vectorized pass.
+    """
+    order = np.argsort(codes, kind='stable')
+    sorted_codes = codes[order]
+    ordered = values[order]
+
+    valid = ~np.isnan(ordered)
+    filled = np.where(valid, ordered, 0.0)
+    zeros = np.zeros((1, ordered.shape[1]))
+    sums = np.vstack([zeros, np.cumsum(filled, axis=0)])
+    squares = np.vstack([zeros, np.cumsum(filled * filled, axis=0)])
+    counts = np.vstack([zeros, np.cumsum(valid, axis=0)])
+
+    rows = np.arange(len(ordered))
+    group_start = np.searchsorted(sorted_codes, sorted_codes, side='left')
+    window_start = np.maximum(group_start, rows - window)
+
+    n = counts[rows] - counts[window_start]
+    total = sums[rows] - sums[window_start]
+    total_sq = squares[rows] - squares[window_start]
+    with np.errstate(invalid='ignore', divide='ignore'):
+        mean = total / n
+        std = np.sqrt(np.maximum(total_sq - n * mean * mean, 0.0) / (n - 1))
+
+    baseline_mean = np.empty_like(mean)
+    baseline_std = np.empty_like(std)
+    baseline_n = np.empty_like(n)
+    baseline_mean[order], baseline_std[order], baseline_n[order] = mean, std, n
+    return baseline_mean, baseline_std, baseline_n
+
+def detect_regressions(df, metrics=None, window=DEFAULT_WINDOW, threshold=DEFAULT_THRESHOLD,
+                       min_history=DEFAULT_MIN_HISTORY, z_threshold=None, runs=None, rows=None, key='Test'):
+    """Flag runs that fall more than `threshold` below the rolling mean of their previous runs.
+
+    Rows are taken to be in run order within each Test. With z_threshold set, a
+    run must also sit that many standard deviations below the baseline. A
+    boolean `rows` mask limits which rows may be flagged (the rest only serve as history).
+    Returns one row per flagged run and metric.
+    """
+    metrics = [m for m in (metrics or REGRESSION_METRICS) if m in df.columns]
+    if df.empty or not metrics:
+        return pd.DataFrame(columns=FLAG_COLUMNS)
+
+    codes, _ = pd.factorize(df[key])
+    values = df[metrics].apply(pd.to_numeric, errors='coerce').to_numpy(dtype=float)
+    mean, std, n = _rolling_baselines(codes, values, window)
+
+    with np.errstate(invalid='ignore', divide='ignore'):
+        change = (values - mean) / mean
+        flagged = (n >= min_history) & (change < -threshold)
+        if z_threshold is not None:
+            flagged &= (mean - values) / std > z_threshold
+    flagged &= codes[:, None] >= 0
+    if rows is not None:
+        flagged &= np.asarray(rows)[:, None]
+
+    if runs is None:
+        runs = df.groupby(key, sort=False).cumcount().to_numpy() + 1
+    hit_rows, hit_cols = np.nonzero(flagged)
+    return pd.DataFrame({
+        'Test': df[key].to_numpy()[hit_rows],
+        'Run': np.asarray(runs)[hit_rows],
+        'Metric': np.asarray(metrics)[hit_cols],
+        'Value': values[hit_rows, hit_cols],
+        'Baseline': mean[hit_rows, hit_cols],
+        'Change %': change[hit_rows, hit_cols] * 100,
+    }, columns=FLAG_COLUMNS)
+
+class RegressionMonitor:
+    """Keep rolling baselines up to date as runs arrive, without rescanning the history.
+
+    Only the last `window` runs of each Test are retained; update() evaluates new
+    rows against those tails and then advances them.
+    """
+
+    def __init__(self, metrics=None, window=DEFAULT_WINDOW, threshold=DEFAULT_THRESHOLD,
+                 min_history=DEFAULT_MIN_HISTORY, z_threshold=None, key='Test'):
+        self.metrics = list(metrics or REGRESSION_METRICS)
+        self.window = window
+        self.threshold = threshold
+        self.min_history = min_history
+        self.z_threshold = z_threshold
+        self.key = key
+        self.flags = pd.DataFrame(columns=FLAG_COLUMNS)
+        self.data_version = None
+        self._tail = pd.DataFrame(columns=[key, 'Run'] + self.metrics)
+
+    @property
+    def settings(self):
+        return (self.window, self.threshold, self.min_history, self.z_threshold)
+
+    def update(self, new_rows):
+        """Evaluate newly appended rows, returning the runs they flag"""
+        key = self.key
+        if new_rows.empty or key not in new_rows.columns:
+            return pd.DataFrame(columns=FLAG_COLUMNS)
+
+        new = new_rows.reindex(columns=[key] + self.metrics)
+        new = new[new[key].notna()]
+
+        runs_seen = self._tail.groupby(key, sort=False)['Run'].max()
+        previous = new[key].map(runs_seen).fillna(0).astype(int).to_numpy()
+        new.insert(1, 'Run', new.groupby(key, sort=False).cumcount().to_numpy() + 1 + previous)
+
+        touched = self._tail[key].isin(new[key])
+        combined = pd.concat([self._tail[touched], new], ignore_index=True)
+        is_new = np.arange(len(combined)) >= touched.sum()
+
+        flags = detect_regressions(combined, self.metrics, self.window, self.threshold, self.min_history,
+                                   self.z_threshold, runs=combined['Run'], rows=is_new, key=key)
+
+        self.flags = pd.concat([self.flags, flags], ignore_index=True) if not self.flags.empty else flags
+        self._tail = pd.concat([self._tail[~touched], combined.groupby(key, sort=False).tail(self.window)],
+                               ignore_index=True)
+        return flags
+
+def main(argv=None):
+    """Headless entry point: report regressions in a results CSV and exit 1 if any are found"""
+    parser = argparse.ArgumentParser(description="Flag benchmark runs that regress against their rolling baseline.")
+    parser.add_argument('path', help="CSV file with a Test column and one row per run, oldest first")
+    parser.add_argument('--metric', action='append', dest='metrics',
+                        help="Metric to check (repeatable); defaults to every known metric present")
+    parser.add_argument('--window', type=int, default=DEFAULT_WINDOW)
+    parser.add_argument('--threshold', type=float, default=DEFAULT_THRESHOLD * 100,
+                        help="Drop below the baseline, in percent, that flags a run")
+    parser.add_argument('--min-history', type=int, default=DEFAULT_MIN_HISTORY)
+    parser.add_argument('--z', type=float, default=None, help="Also require this many standard deviations")
+    args = parser.parse_args(argv)
+
+    df = pd.read_csv(args.path)
+    flags = detect_regressions(df, args.metrics, args.window, args.threshold / 100,
+                               args.min_history, args.z)
+    if flags.empty:
+        print("No regressions found.")
+        return 0
+    print(flags.to_string(index=False, float_format=lambda v: f"{v:.2f}"))
+    return 1
+
+if __name__ == '__main__':
+    sys.exit(main())
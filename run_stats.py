@@ -0,0 +1,107 @@
+import warnings
+
+import numpy as np
+import pandas as pd
+
+BOOTSTRAP_SAMPLES = 1000
+CONFIDENCE = 0.95
+# Upper bound on resampled draws held in memory at once
+BOOTSTRAP_BATCH_VALUES = 8_000_000
+
+def _pad_runs(codes, values, n_groups):
+    """Arrange rows into a (groups x max_runs x metrics) array padded with NaN"""
+    order = np.argsort(codes, kind='stable')
+    codes = codes[order]
+    counts = np.bincount(codes, minlength=n_groups)
+    starts = np.concatenate(([0], np.cumsum(counts)[:-1]))
+    positions = np.arange(len(codes)) - starts[codes]
+
+    runs = np.full((n_groups, max(counts.max(initial=0), 1), values.shape[1]), np.nan)
+    runs[codes, positions] = values[order]
+    return runs, counts
+
+def _bootstrap_means(runs, counts, n_boot, rng):
+    """Resampled means with shape (groups, metrics, n_boot), drawing every group at once.
+
+    Each resample is expressed as per-run draw counts, so one batched matmul
+    computes the resampled means of every metric together.
+    """
+    n_groups, width, n_metrics = runs.shape
+    # Map uniform 16-bit draws onto [0, count) for each group's own run count
+    draws = rng.integers(0, 1 << 16, size=(n_groups, n_boot, width), dtype=np.uint16)
+    idx = (draws * counts.astype(np.uint32)[:, None, None]) >> 16
+    # A resample has as many draws as the group has runs; the padding positions
+    # are sent to an extra slot that is dropped below
+    slots = width + 1
+    np.copyto(idx, width, where=np.arange(width) >= counts[:, None, None])
+
+    offsets = (np.arange(n_groups * n_boot, dtype=np.uint32) * slots).reshape(n_groups, n_boot, 1)
+    weights = np.bincount((idx + offsets).ravel(), minlength=n_groups * n_boot * slots)
+    weights = weights.reshape(n_groups, n_boot, slots)[:, :, :width].astype(np.float32)
+
+    valid = ~np.isnan(runs)
+    totals = weights @ np.where(valid, runs, 0.0).astype(np.float32)
+    sizes = weights @ valid.astype(np.float32)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        return (totals / sizes).transpose(0, 2, 1)
+
+def _percentiles(boot, q):
+    """Linearly interpolated percentiles along the last axis using one sort"""
+    ordered = np.sort(boot, axis=-1)
+    position = np.asarray(q) * (ordered.shape[-1] - 1)
+    lower = np.floor(position).astype(np.intp)
+    upper = np.minimum(lower + 1, ordered.shape[-1] - 1)
+    fraction = position - lower
+    return [ordered[..., lo] * (1 - f) + ordered[..., hi] * f for lo, hi, f in zip(lower, upper, fraction)]
+
+def aggregate_runs(df, metrics, group_column='Test', n_boot=BOOTSTRAP_SAMPLES,
+                   confidence=CONFIDENCE, seed=0):
+    """Collapse repeated runs into one row per group with mean, median, std and bootstrap CIs.
+
+    For every metric the result has the mean under the metric's own name plus
+    '<metric> Median', '<metric> Std', '<metric> CI Low' and '<metric> CI High'.
+    """
+    codes, labels = pd.factorize(df[group_column], sort=False)
+    keep = codes >= 0
+    codes = codes[keep]
+    values = df.loc[keep, metrics].apply(pd.to_numeric, errors='coerce').to_numpy(dtype=float)
+
+    runs, counts = _pad_runs(codes, values, len(labels))
+    n_groups, width, n_metrics = runs.shape
+
+    present = (~np.isnan(runs)).sum(axis=1)
+    with np.errstate(invalid='ignore', divide='ignore'), warnings.catch_warnings():
+        warnings.simplefilter('ignore', RuntimeWarning)
+        means = np.nansum(runs, axis=1) / present
+        medians = np.nanmedian(runs, axis=1)
+        stds = np.sqrt(np.nansum((runs - means[:, None, :]) ** 2, axis=1) / (present - 1))
+    stds[present < 2] = np.nan
+
+    # Resample in batches of groups so memory stays bounded for very large datasets
+    rng = np.random.default_rng(seed)
+    alpha = (1 - confidence) / 2
+    ci_low = np.full((n_groups, n_metrics), np.nan)
+    ci_high = np.full((n_groups, n_metrics), np.nan)
+    batch = max(1, BOOTSTRAP_BATCH_VALUES // (n_boot * width))
+    for start in range(0, n_groups, batch):
+        stop = min(start + batch, n_groups)
+        boot = _bootstrap_means(runs[start:stop], counts[start:stop], n_boot, rng)
+        # A resample that only drew rows missing this metric falls back to the group mean
+        boot = np.where(np.isnan(boot), means[start:stop, :, None], boot)
+        ci_low[start:stop], ci_high[start:stop] = _percentiles(boot, [alpha, 1 - alpha])
+
+    result = pd.DataFrame({group_column: labels, 'Runs': counts})
+    for i, metric in enumerate(metrics):
+        result[metric] = means[:, i]
+        result[f'{metric} Median'] = medians[:, i]
+        result[f'{metric} Std'] = stds[:, i]
+        result[f'{metric} CI Low'] = ci_low[:, i]
+        result[f'{metric} CI High'] = ci_high[:, i]
+    return result
+
+def error_columns(df, metric):
+    """Return the (low, high) CI column names for a metric if the frame has them"""
+    low, high = f'{metric} CI Low', f'{metric} CI High'
+    if low in df.columns and high in df.columns:
+        return low, high
+    return None
@@ -0,0 +1,165 @@
+import hashlib
+import os
+import sys
+import threading
+import weakref
+from collections import OrderedDict
+
+import numpy as np
+import pandas as pd
+
+# Memory the cache may hold for the whole server process, shared by all sessions
+SHARED_CACHE_BUDGET_BYTES = int(os.environ.get('BENCHMARK_CACHE_BUDGET_MB', 1024)) * 1024 * 1024
+# Memory one session may keep pinned (its dataset history plus the figures it shows)
+SESSION_CAP_BYTES = int(os.environ.get('BENCHMARK_SESSION_CAP_MB', 256)) * 1024 * 1024
+
+def _update_digest(digest, part):
+    if isinstance(part, pd.DataFrame):
+        digest.update(repr(list(part.columns)).encode())
+        part = pd.util.hash_pandas_object(part, index=False).to_numpy()
+    elif isinstance(part, pd.Series):
+        part = pd.util.hash_pandas_object(part, index=False).to_numpy()
+    if isinstance(part, np.ndarray):
+        digest.update(part.dtype.str.encode())
+        if part.dtype == object:
+            part = pd.util.hash_array(part)
+        digest.update(np.ascontiguousarray(part).view(np.uint8))
+    elif isinstance(part, bytes):
+        digest.update(part)
+    else:
+        digest.update(repr(part).encode())
+    digest.update(b'\x00')
+
+def content_key(*parts):
+    """Hash arrays, frames and plain values into a key that only depends on their content"""
+    digest = hashlib.blake2b(digest_size=16)
+    for part in parts:
+        _update_digest(digest, part)
+    return digest.hexdigest()
+
+def array_nbytes(values):
+    """Memory held by an array, counting the objects an object array points to"""
+    if values.dtype == object:
+        return values.nbytes + sum(map(sys.getsizeof, values))
+    return values.nbytes
+
+def frame_nbytes(df):
+    return int(df.memory_usage(index=True, deep=True).sum())
+
+class Handle:
+    """A reference to a cached value; the entry stays pinned until every handle to it is gone"""
+
+    __slots__ = ('key', 'value', '__weakref__')
+
+    def __init__(self, key, value):
+        self.key = key
+        self.value = value
+
+class SharedCache:
+    """Process-wide, content-addressed cache shared by all sessions.
+
+    Entries are reference counted through Handles. Entries nobody references
+    stay cached and are evicted least recently used first once the global
+    budget is exceeded; referenced entries are never evicted. Bytes are also
+    tracked per owner (session) so holders can keep themselves under a cap.
+    """
+
+    def __init__(self, budget_bytes=SHARED_CACHE_BUDGET_BYTES, session_cap_bytes=SESSION_CAP_BYTES):
+        self.budget_bytes = budget_bytes
+        self.session_cap_bytes = session_cap_bytes
+        self.hits = 0
+        self.misses = 0
+        # key -> [value, nbytes, refs]
+        self._entries = OrderedDict()
+        self._owners = {}
+        self._bytes = 0
+        self._lock = threading.RLock()
+
+    def acquire(self, key, factory, owner=None, nbytes=None):
+        """Return a Handle to the value for key, calling factory() only if no session has built it yet.
+
+        nbytes is a size or a function of the value; by default the value's
+        own nbytes is used.
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self.hits += 1
+                self._entries.move_to_end(key)
+        if entry is None:
+            # Built outside the lock; if two sessions race, the first stored value wins
+            value = factory()
+            size = nbytes(value) if callable(nbytes) else nbytes
+            if size is None:
+                size = getattr(value, 'nbytes', 0)
+            with self._lock:
+                entry = self._entries.get(key)
+                if entry is None:
+                    self.misses += 1
+                    entry = [value, int(size), 0]
+                    self._entries[key] = entry
+                    self._bytes += entry[1]
+                else:
+                    self.hits += 1
+
+        with self._lock:
+            entry[2] += 1
+            owned = self._owners.setdefault(owner, {})
+            owned[key] = owned.get(key, 0) + 1
+            handle = Handle(key, entry[0])
+            self._evict()
+        weakref.finalize(handle, self._release, key, owner)
+        return handle
+
+    def intern(self, key, value, owner=None, nbytes=None):
+        """Store an already built value, returning a Handle to the shared copy if one exists"""
+        return self.acquire(key, lambda: value, owner, nbytes)
+
+    def _release(self, key, owner):
+        with self._lock:
+            owned = self._owners.get(owner)
+            if owned is not None:
+                owned[key] -= 1
+                if not owned[key]:
+                    del owned[key]
+                if not owned:
+                    del self._owners[owner]
+            entry = self._entries.get(key)
+            if entry is not None:
+                entry[2] -= 1
+                self._evict()
+
+    def _evict(self):
+        if self._bytes <= self.budget_bytes:
+            return
+        for key in [k for k, entry in self._entries.items() if entry[2] <= 0]:
+            self._bytes -= self._entries.pop(key)[1]
+            if self._bytes <= self.budget_bytes:
+                break
+
+    def owner_bytes(self, owner):
+        """Bytes of the distinct entries an owner holds handles to"""
+        with self._lock:
+            return sum(self._entries[key][1] for key in self._owners.get(owner, ()) if key in self._entries)
+
+    def over_session_cap(self, owner):
+        return owner is not None and self.owner_bytes(owner) > self.session_cap_bytes
+
+    def stats(self):
+        with self._lock:
+            return {
+                'entries': len(self._entries),
+                'bytes': self._bytes,
+                'pinned': sum(1 for entry in self._entries.values() if entry[2] > 0),
+                'sessions': sum(1 for owner in self._owners if owner is not None),
+                'hits': self.hits,
+                'misses': self.misses,
+            }
+
+    def clear(self):
+        """Drop every unreferenced entry"""
+        with self._lock:
+            for key in [k for k, entry in self._entries.items() if entry[2] <= 0]:
+                self._bytes -= self._entries.pop(key)[1]
+
+shared_cache = SharedCache()
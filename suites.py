@@ -0,0 +1,85 @@
+import numpy as np
+import pandas as pd
+
+from aggregation import split_test_labels
+
+# Sub-score columns are stored next to the overall Score as "Score: <name>"
+SUB_SCORE_PREFIX = 'Score: '
+# Name of the overall Score among the sub-scores
+OVERALL = 'Score'
+
+def score_columns(df):
+    """The overall Score column and any sub-score columns, in table order"""
+    return [col for col in df.columns if col == 'Score' or str(col).startswith(SUB_SCORE_PREFIX)]
+
+def sub_score_name(column):
+    return OVERALL if column == 'Score' else str(column)[len(SUB_SCORE_PREFIX):]
+
+def _category_rows(codes, n_categories):
+    """Row positions of every category code, from one stable sort"""
+    order = np.argsort(codes, kind='stable')
+    bounds = np.searchsorted(codes[order], np.arange(n_categories + 1))
+    return [order[bounds[i]:bounds[i + 1]] for i in range(n_categories)]
+
+class ScoreTable:
+    """Points results reshaped once into a long table: one row per test, suite and sub-score.
+
+    Suite and Sub-score are categoricals and the row positions of every category
+    are precomputed, so selections only touch the rows they return. Tests without
+    a Suite take the title part of their label as the suite.
+    """
+
+    def __init__(self, df):
+        columns = score_columns(df)
+        n_rows, n_scores = len(df), len(columns)
+        values = df[columns].apply(pd.to_numeric, errors='coerce').to_numpy(dtype=float).ravel()
+
+        suites = split_test_labels(df['Test'])['Title']
+        if 'Suite' in df.columns:
+            suites = df['Suite'].where(df['Suite'].notna(), suites)
+        suite_codes, suite_names = pd.factorize(suites.astype(str))
+
+        keep = ~np.isnan(values)
+        self.suites = list(suite_names)
+        self.sub_scores = [sub_score_name(col) for col in columns]
+        self.long = pd.DataFrame({
+            'Test': np.repeat(df['Test'].to_numpy(), n_scores)[keep],
+            'Suite': pd.Categorical.from_codes(np.repeat(suite_codes, n_scores)[keep], self.suites),
+            'Sub-score': pd.Categorical.from_codes(np.tile(np.arange(n_scores), n_rows)[keep], self.sub_scores),
+            'Value': values[keep],
+        })
+
+        self._suite_rows = _category_rows(self.long['Suite'].cat.codes.to_numpy(), len(self.suites))
+        self._sub_score_codes = self.long['Sub-score'].cat.codes.to_numpy()
+        self._sub_score_rows = _category_rows(self._sub_score_codes, len(self.sub_scores))
+        self.nbytes = int(self.long.memory_usage(index=True).sum())
+
+    def rows(self, suites=None, sub_scores=None):
+        """Positions of the rows in the selected suites and sub-scores (None selects all), in table order"""
+        if suites is None and sub_scores is None:
+            return np.arange(len(self.long))
+        if suites is None:
+            parts = [self._sub_score_rows[self.sub_scores.index(s)] for s in sub_scores]
+            return np.sort(np.concatenate(parts)) if parts else np.empty(0, dtype=np.intp)
+
+        parts = [self._suite_rows[self.suites.index(s)] for s in suites]
+        positions = np.concatenate(parts) if parts else np.empty(0, dtype=np.intp)
+        if sub_scores is not None:
+            # Only the codes of the suites' own rows are checked
+            wanted = np.zeros(len(self.sub_scores), dtype=bool)
+            wanted[[self.sub_scores.index(s) for s in sub_scores]] = True
+            positions = positions[wanted[self._sub_score_codes[positions]]]
+        return np.sort(positions)
+
+    def select(self, suites=None, sub_scores=None, tests=None):
+        long = self.long.iloc[self.rows(suites, sub_scores)]
+        if tests is not None:
+            long = long[long['Test'].isin(tests)]
+        return long
+
+def to_wide(long):
+    """Pivot long score rows to one row per Test with a column per sub-score, averaging repeated runs"""
+    wide = long.pivot_table(index='Test', columns='Sub-score', values='Value', aggfunc='mean',
+                            observed=True, sort=False)
+    wide.columns = [str(col) for col in wide.columns]
+    return wide.reset_index()
@@ -0,0 +1,19 @@
+import pandas as pd
+
+from chart_builder import build_bar_chart, build_line_chart, extend_chart
+
+RESULTS = pd.DataFrame({'Test': ['A', 'B', 'C'], 'Avg FPS': [60.0, 75.5, 90.0]})
+NEW_ROWS = pd.DataFrame({'Test': ['D', 'E'], 'Avg FPS': [45.0, 120.0]})
+
+def test_extend_bar_chart():
+    fig = extend_chart(build_bar_chart(RESULTS, 'Test', 'Avg FPS', 'dark'), NEW_ROWS, 'Test', 'Avg FPS')
+    trace = fig.data[0]
+    assert list(trace.y) == ['A', 'B', 'C', 'D', 'E']
+    assert list(trace.x) == [60.0, 75.5, 90.0, 45.0, 120.0]
+
+def test_extend_line_chart():
+    fig = extend_chart(build_line_chart(RESULTS, 'Test', 'Avg FPS', 'light'), NEW_ROWS, 'Test', 'Avg FPS')
+    trace = fig.data[0]
+    # The built chart is sorted by value; new rows are appended after it
+    assert list(trace.x) == ['C', 'B', 'A', 'D', 'E']
+    assert list(trace.y) == [90.0, 75.5, 60.0, 45.0, 120.0]
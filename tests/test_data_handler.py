@@ -0,0 +1,68 @@
+import pandas as pd
+import pytest
+
+from data_handler import (
+    FileFormatError,
+    FileTailer,
+    RunningMeans,
+    check_import_path,
+    detect_import_units,
+    normalize_chunk,
+    normalize_units
+)
+
+def test_running_means_keeps_suite_labels():
+    means = RunningMeans()
+    means.add(pd.DataFrame({'Test': ['A', 'B'], 'Suite': ['Cinebench', None], 'Score': ['100', '40']}))
+    means.add(pd.DataFrame({'Test': ['A', 'B'], 'Suite': ['Cinebench', None], 'Score': ['200', '60']}))
+    result = means.result()
+    assert result['Suite'].tolist()[0] == 'Cinebench'
+    assert pd.isna(result['Suite'].tolist()[1])
+    assert result['Score'].tolist() == [150.0, 50.0]
+
+def test_check_import_path_requires_root(tmp_path, monkeypatch):
+    (tmp_path / 'results.csv').write_text("Test,Avg FPS\nA,60\n")
+    monkeypatch.delenv('BENCHMARK_IMPORT_ROOT', raising=False)
+    with pytest.raises(FileFormatError):
+        check_import_path(str(tmp_path / 'results.csv'))
+
+    monkeypatch.setenv('BENCHMARK_IMPORT_ROOT', str(tmp_path))
+    assert check_import_path('results.csv') == str(tmp_path / 'results.csv')
+    with pytest.raises(FileFormatError):
+        check_import_path('../outside.csv')
+
+def test_normalize_units_drops_extreme_with_fps_counterpart():
+    df = pd.DataFrame({'Test': ['A'], 'Max FPS': [10.0], 'Min FPS': [40.0]})
+    mapping = {'Test': 'Test', 'Max FPS': 'Max Frametime (ms)', 'Min FPS': 'Min FPS'}
+    result = normalize_units(df, mapping)
+    assert result.columns.tolist() == ['Test', 'Min FPS']
+    assert result['Min FPS'].tolist() == [40.0]
+
+def test_tailer_reads_files_created_after_start(tmp_path):
+    (tmp_path / 'a.csv').write_text("Test,Avg FPS\nA,60\n")
+    tailer = FileTailer(str(tmp_path), from_end=True)
+    assert tailer.poll().empty
+
+    (tmp_path / 'b.csv').write_text("Test,Avg FPS\nB,70\nC,80\n")
+    with open(tmp_path / 'a.csv', 'a') as f:
+        f.write("D,90\n")
+    assert sorted(tailer.poll()['Test']) == ['B', 'C', 'D']
+
+def test_tailer_rereads_replaced_file(tmp_path):
+    log = tmp_path / 'a.csv'
+    log.write_text("Test,Avg FPS\nA,60\nB,70\nC,80\n")
+    tailer = FileTailer(str(log), from_end=True)
+    assert tailer.poll().empty
+
+    log.write_text("Test,Avg FPS\nE,50\n")
+    assert tailer.poll()['Test'].tolist() == ['E']
+
+def test_normalize_chunk_uses_units_decided_for_the_import():
+    mapping = {'Test': 'Game', 'Avg FPS': 'Avg', '1% Low': 'Low'}
+    preview = pd.DataFrame({'Game': ['A', 'B'], 'Avg': [10.0, 20.0], 'Low': [12.5, 25.0]})
+    units = detect_import_units(preview, 'FPS', mapping)
+    assert units == ['Avg FPS', '1% Low']
+
+    # Lows missing from this chunk, so on its own it would be taken as FPS
+    chunk = pd.DataFrame({'Game': ['C'], 'Avg': [8.0], 'Low': [None]})
+    assert normalize_chunk(chunk, 'FPS', mapping, frametime_columns=units)['Avg FPS'].tolist() == [125.0]
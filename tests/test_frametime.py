@@ -0,0 +1,18 @@
+import io
+
+import numpy as np
+
+from frametime import read_frametimes
+
+def test_read_frametimes_named_column():
+    frames = read_frametimes(io.BytesIO(b"Application,MsBetweenPresents\ngame.exe,16.6\ngame.exe,17\n"))
+    assert frames.dtype == np.float32
+    np.testing.assert_allclose(frames, [16.6, 17.0], rtol=1e-6)
+
+def test_read_frametimes_headerless_log_keeps_first_frame():
+    frames = read_frametimes(io.BytesIO(b"16.6\n17\n"))
+    np.testing.assert_allclose(frames, [16.6, 17.0], rtol=1e-6)
+
+def test_read_frametimes_skips_non_numeric_rows():
+    frames = read_frametimes(io.BytesIO(b"Frametime\n16.6\ndropped\n17\n"))
+    np.testing.assert_allclose(frames, [16.6, 17.0], rtol=1e-6)
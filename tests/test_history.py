@@ -0,0 +1,21 @@
+import pandas as pd
+import pytest
+
+from history import DatasetHistory
+
+def test_shared_frame_is_read_only():
+    frame = DatasetHistory(pd.DataFrame({'Test': ['A', 'B'], 'Avg FPS': [60.0, 70.0]})).frame
+    with pytest.raises(ValueError):
+        frame.loc[0, 'Avg FPS'] = 1.0
+    assert frame['Avg FPS'].tolist() == [60.0, 70.0]
+
+def test_session_copy_edits_stay_private():
+    df = pd.DataFrame({'Test': ['A', 'B'], 'Avg FPS': [60.0, 70.0]})
+    first, second = DatasetHistory(df), DatasetHistory(df)
+    assert first.frame is second.frame
+
+    session_view = first.frame.copy(deep=False)
+    session_view.sort_values('Avg FPS', ascending=False, inplace=True)
+    session_view.loc[0, 'Avg FPS'] = 1.0
+    assert second.frame['Avg FPS'].tolist() == [60.0, 70.0]
+    assert second.frame['Test'].tolist() == ['A', 'B']
@@ -0,0 +1,9 @@
+from import_budget import APP_MODULES, check_cold_start_budget
+
+def test_app_modules_follow_app_imports():
+    assert {'utils', 'data_handler', 'chart_builder', 'import_jobs', 'suites'} <= set(APP_MODULES)
+
+def test_cold_start_within_budget():
+    total_ms, eager, within_budget = check_cold_start_budget()
+    assert not eager, f"Loaded eagerly: {', '.join(eager)}"
+    assert within_budget, f"Cold start took {total_ms:.0f} ms"
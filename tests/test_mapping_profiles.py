@@ -0,0 +1,11 @@
+from mapping_profiles import guess_column_mapping
+
+def test_guess_maps_fps_headers():
+    mapping = guess_column_mapping(['Benchmark', 'Average FPS', 'Maximum fps', 'Min_FPS', '1% Low'])
+    assert mapping == {'Test': 'Benchmark', 'Avg FPS': 'Average FPS', '1% Low': '1% Low',
+                       'Max FPS': 'Maximum fps', 'Min FPS': 'Min_FPS'}
+
+def test_guess_maps_frametime_headers():
+    mapping = guess_column_mapping(['Game', 'Avg Frametime (ms)', 'Max Frame Time (ms)', 'Min_Frametime_ms'])
+    assert mapping == {'Test': 'Game', 'Avg FPS': 'Avg Frametime (ms)',
+                       'Max FPS': 'Max Frame Time (ms)', 'Min FPS': 'Min_Frametime_ms'}
@@ -0,0 +1,80 @@
+from io import BytesIO
+
+import pytest
+from PIL import Image
+
+import utils
+
+def _png_bytes():
+    buffered = BytesIO()
+    Image.new('RGB', (4, 4), 'orange').save(buffered, format='PNG')
+    return buffered.getvalue()
+
+class StubResponse:
+    def __init__(self, status_code, content=b'', headers=None):
+        self.status_code = status_code
+        self.content = content
+        self.headers = headers or {}
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def raise_for_status(self):
+        if self.status_code >= 400:
+            raise RuntimeError(f"HTTP {self.status_code}")
+
+    def iter_content(self, chunk_size):
+        for start in range(0, len(self.content), chunk_size):
+            yield self.content[start:start + chunk_size]
+
+class StubSession:
+    """Serves one image with an ETag, answering 304 to a matching If-None-Match"""
+
+    def __init__(self, content, etag='"v1"', headers=None):
+        self.content = content
+        self.etag = etag
+        self.headers = headers or {}
+        self.requests = []
+
+    def get(self, url, headers=None, timeout=None, stream=False):
+        self.requests.append(dict(headers or {}))
+        if (headers or {}).get('If-None-Match') == self.etag:
+            return StubResponse(304)
+        return StubResponse(200, self.content, {'ETag': self.etag, **self.headers})
+
+@pytest.fixture
+def clock(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(utils.time, 'monotonic', lambda: now[0])
+    utils._asset_cache.clear()
+    yield now
+    utils._asset_cache.clear()
+
+def test_fetch_rejects_declared_size_over_limit():
+    session = StubSession(b'x', headers={'Content-Length': str(utils.MAX_IMAGE_BYTES + 1)})
+    with pytest.raises(ValueError):
+        utils._fetch_url('http://stub/big.png', session=session)
+
+def test_fetch_rejects_streamed_size_over_limit(monkeypatch):
+    monkeypatch.setattr(utils, 'MAX_IMAGE_BYTES', 1024)
+    with pytest.raises(ValueError):
+        utils._fetch_url('http://stub/big.png', session=StubSession(b'x' * 2048))
+
+def test_load_image_url_caches_then_revalidates(clock):
+    session = StubSession(_png_bytes())
+    img = utils.load_image_url('http://stub/logo.png', session=session)
+    assert img.size == (4, 4)
+    assert session.requests == [{}]
+
+    # Within the revalidation window the cached image is returned without a request
+    clock[0] += utils.ASSET_REVALIDATE_SECONDS - 1
+    assert utils.load_image_url('http://stub/logo.png', session=session) is img
+    assert len(session.requests) == 1
+
+    # Afterwards the ETag is sent and a 304 keeps the cached image
+    clock[0] += 2
+    assert utils.load_image_url('http://stub/logo.png', session=session) is img
+    assert session.requests[-1] == {'If-None-Match': '"v1"'}
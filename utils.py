@@ -1,8 +1,10 @@
 import streamlit as st
-from PIL import Image
-import requests
 from io import BytesIO
+from collections import OrderedDict
 import base64
+import os
+import threading
+import time
 
 def set_page_config():
     """Set up the page configuration"""
@@ -90,19 +92,151 @@ def apply_custom_css():
     else:
         st.markdown(light_theme_css, unsafe_allow_html=True)
 
-def load_image_url(url):
-    """Load an image from a URL"""
+class _AssetCache:
+    """Thread-safe LRU cache of decoded images keyed by path or URL"""
+
+    def __init__(self, max_entries):
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+            return entry
+
+    def put(self, key, entry):
+        with self._lock:
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def find_image(self, img):
+        """Return the entry holding this exact image object, if any"""
+        with self._lock:
+            for entry in self._entries.values():
+                if entry['image'] is img:
+                    return entry
+        return None
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+# Cached assets live for the whole server process and are shared by all sessions
+ASSET_CACHE_SIZE = 32
+# Cached assets are trusted for this long before their mtime/ETag is checked again
+ASSET_REVALIDATE_SECONDS = 60
+# (connect, read) timeouts for remote images
+HTTP_TIMEOUT = (3.05, 10)
+MAX_IMAGE_BYTES = 10 * 1024 * 1024
+
+_asset_cache = _AssetCache(ASSET_CACHE_SIZE)
+_http_session = None
+_http_session_lock = threading.Lock()
+
+def get_http_session():
+    """Return the pooled HTTP session shared by all remote asset fetches"""
+    global _http_session
+    with _http_session_lock:
+        if _http_session is None:
+            # Loaded on first use: remote images are rarely requested
+            import requests
+            from requests.adapters import HTTPAdapter
+
+            session = requests.Session()
+            adapter = HTTPAdapter(pool_connections=4, pool_maxsize=8, max_retries=2)
+            session.mount('http://', adapter)
+            session.mount('https://', adapter)
+            _http_session = session
+        return _http_session
+
+def _decode_image(data):
+    """Decode image bytes into a fully loaded PIL image"""
+    from PIL import Image
+
+    img = Image.open(BytesIO(data))
+    img.load()
+    return img
+
+def _fetch_url(url, etag=None, session=None):
+    """Fetch a URL, returning (status_code, content, etag); content is None when not modified.
+
+    Any object with a requests-compatible get() can be passed as session, so a
+    local stub can stand in for the network.
+    """
+    session = session or get_http_session()
+    headers = {'If-None-Match': etag} if etag else {}
+    with session.get(url, headers=headers, timeout=HTTP_TIMEOUT, stream=True) as response:
+        if response.status_code == 304:
+            return 304, None, etag
+        response.raise_for_status()
+
+        declared = int(response.headers.get('Content-Length') or 0)
+        if declared > MAX_IMAGE_BYTES:
+            raise ValueError(f"Image is larger than {MAX_IMAGE_BYTES // (1024 * 1024)} MB")
+
+        buffered = BytesIO()
+        for chunk in response.iter_content(chunk_size=64 * 1024):
+            buffered.write(chunk)
+            if buffered.tell() > MAX_IMAGE_BYTES:
+                raise ValueError(f"Image is larger than {MAX_IMAGE_BYTES // (1024 * 1024)} MB")
+        return response.status_code, buffered.getvalue(), response.headers.get('ETag')
+
+def load_image(path):
+    """Load a local image, memoized by path and modification time"""
+    entry = _asset_cache.get(path)
+    now = time.monotonic()
+    if entry is not None and now - entry['checked'] < ASSET_REVALIDATE_SECONDS:
+        return entry['image']
+
+    mtime = os.stat(path).st_mtime_ns
+    if entry is not None and entry['validator'] == mtime:
+        entry['checked'] = now
+        return entry['image']
+
+    with open(path, 'rb') as f:
+        img = _decode_image(f.read())
+    _asset_cache.put(path, {'image': img, 'validator': mtime, 'checked': now, 'png': None})
+    return img
+
+def load_image_url(url, session=None):
+    """Load an image from a URL, memoized by URL and revalidated with its ETag"""
+    entry = _asset_cache.get(url)
+    now = time.monotonic()
+    if entry is not None and now - entry['checked'] < ASSET_REVALIDATE_SECONDS:
+        return entry['image']
+
     try:
-        response = requests.get(url)
-        img = Image.open(BytesIO(response.content))
+        status, content, etag = _fetch_url(url, entry['validator'] if entry else None, session)
+        if status == 304 and entry is not None:
+            entry['checked'] = now
+            return entry['image']
+
+        img = _decode_image(content)
+        _asset_cache.put(url, {'image': img, 'validator': etag, 'checked': now, 'png': None})
         return img
     except Exception as e:
         st.error(f"Error loading image: {str(e)}")
         return None
 
-def get_image_base64(img):
-    """Convert PIL image to base64 string"""
+def get_image_png(img):
+    """Encode a PIL image as PNG bytes, reusing the encoding for cached assets"""
+    entry = _asset_cache.find_image(img)
+    if entry is not None and entry['png'] is not None:
+        return entry['png']
+
     buffered = BytesIO()
     img.save(buffered, format="PNG")
-    img_str = base64.b64encode(buffered.getvalue()).decode()
+    png = buffered.getvalue()
+    if entry is not None:
+        entry['png'] = png
+    return png
+
+def get_image_base64(img):
+    """Convert PIL image to base64 string"""
+    img_str = base64.b64encode(get_image_png(img)).decode()
     return img_str